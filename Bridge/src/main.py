@@ -21,19 +21,136 @@ from midi.input_manager import InputManager
 from dali_control.manager import DaliManager
 import time
 import threading
-import re
+import hashlib
+import heapq
 import json
+import queue
+from collections import deque
 import os
+import sys
 from pathlib import Path
-import subprocess
-import glob
-import tempfile
-import requests
+
+try:
+    import pyudev  # Linux hotplug notifications for MIDI port refresh
+    PYUDEV_AVAILABLE = True
+except ImportError:
+    PYUDEV_AVAILABLE = False
 
 
 VERSION = "1.2"
 
 PERSIST_SETTINGS = False  # Toggle when external config storage becomes safe again
+OSC_STATUS_TIMEOUT = 2.0  # seconds without OSC messages before the status shows "Listening"
+FIRMWARE_REBOOT_TIMEOUT = 15.0  # seconds to wait for the Nowde MIDI port to come back after OTA
+FIRMWARE_PORT_POLL_INTERVAL = 0.25  # seconds between MIDI port polls while waiting for the reboot
+ESP_IMAGE_MAGIC = 0xE9  # First byte of an ESP32 app image
+ESP_IMAGE_HEADER_SIZE = 24  # Image header + extended header, segments follow
+CONFIG_SAVE_DELAY = 0.5  # seconds; config writes are coalesced until changes stop for this long
+
+LOG_MAX_LINES = 1000  # Lines kept in each GUI log pane
+LOG_FLUSH_INTERVAL = 0.1  # seconds between log pane redraws (10Hz)
+REMOTE_TABLE_MIN_INTERVAL = 0.1  # seconds between Remote Nowdes table refreshes
+LAYER_TIME_UI_INTERVAL = 1.0 / 30  # seconds; /media/time refreshes a layer row at 30Hz at most
+DALI_SCAN_INTERVAL = 30.0  # seconds between DALI channel presence scans (conservative to avoid congestion)
+SIM_CLOCK_TEXT_INTERVAL = 0.1  # seconds between simulation clock position label updates (10Hz)
+REMOTE_NOWDE_EXPIRY_MS = 900000  # GONE rows are dropped after 15 minutes unseen
+RUNNING_STATE_QUERY_INTERVAL = 2.0  # seconds; 0.5Hz query rate to reduce large SysEx bursts
+UI_FRAME_INTERVAL = 1.0 / 60  # seconds; frame cap when vsync is unavailable (headless, some drivers)
+MIDI_REFRESH_INTERVAL = 2.0  # seconds between MIDI port polls
+MIDI_HOTPLUG_POLL_INTERVAL = 10.0  # watchdog poll when hotplug notifications are available
+MIDI_HOTPLUG_SETTLE = 0.3  # seconds to let a burst of hotplug events settle before refreshing
+MIDI_PORT_SETTLE = 0.1  # seconds a freshly opened output port gets before QUERY_CONFIG (MIDI TX thread)
+SENDER_INIT_SETTLE = 0.1  # seconds between the HELLO config push and the RUNNING_STATE query (MIDI TX thread)
+MEDIA_SYNC_KEEPALIVE = 1.0  # seconds; resend unchanged frames well within the receivers' 10s link-lost timeout
+
+# Tagged items of the layer editor modal (deleted together with the window)
+LAYER_EDITOR_TAGS = ("layer_editor_modal", "layer_custom_input", "layer_listbox")
+# Tag suffixes of a light row
+LIGHT_ROW_SUFFIXES = ("", "_channel", "_value", "_status")
+# Layer state cell text colors and labels
+LAYER_STATE_COLORS = {"playing": (0, 255, 0), "paused": (255, 255, 0), "stopped": (255, 0, 0)}
+LAYER_STATE_DEFAULT_COLOR = (150, 150, 150)  # Unknown state, and any state but playing on row creation
+LAYER_STATE_LABELS = {state: state.upper() for state in LAYER_STATE_COLORS}
+
+# Simulation combo choices of a Remote Nowde row
+SIM_OPTIONS = ('Disabled', 'Stop') + tuple(str(i) for i in range(1, 11))
+# Simulation mode -> (media_index, state) sent by the simulation clock
+SIM_MODE_FRAMES = {'Stop': (0, 'stopped'), **{str(i): (i, 'playing') for i in range(1, 11)}}
+
+
+def check_firmware_image(data):
+    """Validate a downloaded ESP32 app image; returns an error message, or None when intact
+    
+    The image carries its own size (segment headers) and a SHA-256 of everything
+    before it, so truncated or corrupted downloads are caught whatever the HTTP
+    transfer encoding was.
+    """
+    if len(data) < ESP_IMAGE_HEADER_SIZE or data[0] != ESP_IMAGE_MAGIC:
+        return "not an ESP32 firmware image"
+    
+    # Walk the segment headers (load address, length) to the end of the image
+    pos = ESP_IMAGE_HEADER_SIZE
+    for _ in range(data[1]):
+        if pos + 8 > len(data):
+            return f"truncated image ({len(data)} bytes)"
+        pos += 8 + int.from_bytes(data[pos + 4:pos + 8], 'little')
+    # Checksum byte ends the 16-byte aligned block after the segments
+    pos = (pos + 16) & ~15
+    
+    if not data[23]:
+        return None if len(data) >= pos else f"truncated image ({len(data)}/{pos} bytes)"
+    if len(data) < pos + 32:
+        return f"truncated image ({len(data)}/{pos + 32} bytes)"
+    if hashlib.sha256(memoryview(data)[:pos]).digest() != data[pos:pos + 32]:
+        return "SHA-256 mismatch"
+    return None
+
+
+def _on_media_time(layer, args):
+    """/media/time: (position, duration)"""
+    if len(args) < 2:
+        return
+    layer["position"] = float(args[0])
+    layer["duration"] = float(args[1])
+    # Only set state to playing if we have a filename (media has started)
+    # This prevents sending mediaIndex=0 when /media/time arrives before /mediaStarted
+    if layer["filename"]:
+        layer["state"] = "playing"
+
+
+def _on_media_started(layer, args):
+    """/mediaStarted: (index, filename, duration)"""
+    if len(args) < 2:
+        return
+    layer["filename"] = str(args[1])
+    layer["duration"] = float(args[2]) if len(args) > 2 else 0.0
+    layer["position"] = 0.0
+    layer["state"] = "playing"
+
+
+def _on_media_stopped(layer, args):
+    """/mediaStopped: (index, filename, duration)"""
+    if len(args) < 2:
+        return
+    stopped_filename = str(args[1])
+    
+    # Only apply stop if the stopped filename matches current playing filename
+    # This prevents old mediaStopped messages from stopping newly started media
+    # when switching media without explicit stop (Millumin behavior)
+    if layer["filename"] == stopped_filename or layer["filename"] == "":
+        layer["filename"] = ""
+        layer["duration"] = 0.0
+        layer["position"] = 0.0
+        layer["state"] = "stopped"
+    # else: ignore - a new media is already playing
+
+
+# Millumin layer routes ("/millumin/layer:<name><route>"); other routes only register the layer
+MILLUMIN_ROUTE_HANDLERS = {
+    "/media/time": _on_media_time,
+    "/mediaStarted": _on_media_started,
+    "/mediaStopped": _on_media_stopped,
+}
 
 
 def get_config_path():
@@ -46,18 +163,16 @@ def get_config_path():
     - Fallback: ./config.json (current directory)
     """
     try:
-        if os.name == 'posix':
-            # macOS and Linux
-            if os.uname().sysname == 'Darwin':
-                # macOS
-                config_dir = Path.home() / "Library" / "Application Support" / "MilluBridge"
-            else:
-                # Linux
-                config_dir = Path.home() / ".config" / "millubridge"
-        elif os.name == 'nt':
+        if sys.platform == 'darwin':
+            # macOS
+            config_dir = Path.home() / "Library" / "Application Support" / "MilluBridge"
+        elif sys.platform == 'win32':
             # Windows
             appdata = os.getenv('APPDATA')
             config_dir = Path(appdata) / "MilluBridge" if appdata else Path(".")
+        elif os.name == 'posix':
+            # Linux and other POSIX systems
+            config_dir = Path.home() / ".config" / "millubridge"
         else:
             # Fallback
             config_dir = Path(".")
@@ -83,71 +198,133 @@ class MediaSyncManager:
         self.output_manager = output_manager
         self.bridge = bridge
         self.throttle_interval = throttle_interval  # seconds (default 10Hz = 0.1s)
-        self.layers_state = {}  # {layer_name: {index, position, state, last_sent_time, last_sent_index}}
+        self.layers_state = {}  # {layer_name: {index, position, state, last_sent_*, sysex_buf}}
     
     def parse_media_index(self, filename):
         """Parse media index from filename (1-3 digits at start)"""
         if not filename:
             return 0
         
-        # Match 1-3 digits at the start of filename
-        match = re.match(r'^(\d{1,3})_', filename)
-        if match:
-            index = int(match.group(1))
-            # Clamp to MIDI valid range (1-127, 0 reserved for stop)
-            return min(max(index, 1), 127)
-        return 0  # No index found
+        # Match 1-3 digits followed by '_' at the start of filename
+        index = 0
+        i = 0
+        n = min(3, len(filename))
+        while i < n:
+            digit = ord(filename[i]) - 48
+            if not 0 <= digit <= 9:
+                break
+            index = index * 10 + digit
+            i += 1
+        
+        if i == 0 or i >= len(filename) or filename[i] != '_':
+            return 0  # No index found
+        
+        # Clamp to MIDI valid range (1-127, 0 reserved for stop)
+        return 127 if index > 127 else (1 if index < 1 else index)
     
     def update_layer(self, layer_name, filename, position, duration, state):
-        """Update layer state and send MIDI if needed"""
-        current_time = time.time()
-        # Media index is always 0 when stopped, otherwise parse from filename
-        media_index = 0 if state == 'stopped' else self.parse_media_index(filename)
+        """Update layer state and send MIDI if needed
         
+        Only the scheduler thread sends (continuous_media_sync), so layer entries
+        are created by that thread alone. Each layer's lock guards its last_sent_*
+        fields against reset_sent_state(), which runs on connect (GUI thread)
+        and on HELLO (MIDI listener thread).
+        """
         # Initialize layer state if needed
-        if layer_name not in self.layers_state:
-            self.layers_state[layer_name] = {
+        layer_state = self.layers_state.get(layer_name)
+        if layer_state is None:
+            layer_state = self.layers_state[layer_name] = {
                 'index': 0,
                 'position': 0.0,
                 'state': 'stopped',
                 'last_sent_time': 0,
-                'last_sent_index': -1
+                'last_sent_index': -1,
+                'last_sent_state': None,
+                'last_sent_position': 0.0,
+                'sysex_buf': self.output_manager.new_media_sync_buffer(layer_name),
+                'lock': threading.Lock()
             }
         
-        layer_state = self.layers_state[layer_name]
-        
-        # Update state
-        layer_state['index'] = media_index
-        layer_state['position'] = position
-        layer_state['state'] = state
-        
-        # Determine if we should send (throttled updates for all states)
-        should_send = False
+        if state == 'stopped':
+            with layer_state['lock']:
+                # Idle layers: one stop packet on transition, then only keepalives
+                # (a lost ESP-NOW stop frame must not leave receivers playing)
+                if (layer_state['last_sent_state'] == 'stopped' and layer_state['last_sent_index'] == 0
+                        and time.monotonic() - layer_state['last_sent_time'] < MEDIA_SYNC_KEEPALIVE):
+                    return
+                
+                # Media index is always 0 when stopped
+                layer_state['index'] = 0
+                layer_state['position'] = 0.0
+                layer_state['state'] = state
+                # The layer's SysEx frame is filled in place, so it is sent under the lock too
+                self.output_manager.send_media_sync_into(layer_state['sysex_buf'], 0, 0, state)
+                layer_state['last_sent_time'] = time.monotonic()
+                layer_state['last_sent_index'] = 0
+                layer_state['last_sent_state'] = state
+            return
         
-        # Send on index change (media change)
-        if media_index != layer_state['last_sent_index']:
-            should_send = True
-        # Throttled updates for all states (playing or stopped)
-        elif (current_time - layer_state['last_sent_time']) >= self.throttle_interval:
-            should_send = True
+        media_index = self.parse_media_index(filename)
         
-        if should_send:
+        with layer_state['lock']:
+            current_time = time.monotonic()
+            
+            # Update state
+            layer_state['index'] = media_index
+            layer_state['position'] = position
+            layer_state['state'] = state
+            
+            # Send on index change (media change), otherwise throttled updates
+            same_media = (media_index == layer_state['last_sent_index']
+                          and state == layer_state['last_sent_state'])
+            elapsed = current_time - layer_state['last_sent_time']
+            if same_media and elapsed < self.throttle_interval:
+                return
+            
+            sync_settings = self.bridge.sync_settings
+            fps = sync_settings['mtc_framerate']
+            
+            # Position moved less than one frame (e.g. paused media): only keepalives
+            if (same_media and elapsed < MEDIA_SYNC_KEEPALIVE and fps > 0
+                    and abs(position - layer_state['last_sent_position']) < 1.0 / fps):
+                return
+            
             # Send media sync via SysEx 0x10
-            position_ms = int(position * 1000)  # Convert to milliseconds
             # Apply frame correction offset (convert frames to milliseconds based on FPS)
-            frame_correction_frames = self.bridge.sync_settings['frame_correction_frames']
-            fps = self.bridge.sync_settings['mtc_framerate']
-            frame_correction_ms = int((frame_correction_frames / fps) * 1000) if fps > 0 else 0
-            corrected_position_ms = max(0, position_ms + frame_correction_ms)
-            self.output_manager.send_media_sync(
-                layer_name=layer_name,
-                media_index=media_index,
-                position_ms=corrected_position_ms,
-                state=state
+            frame_correction_s = sync_settings['frame_correction_frames'] / fps if fps > 0 else 0.0
+            # Single scale + round to milliseconds
+            corrected_position_ms = max(0, round((position + frame_correction_s) * 1000))
+            self.output_manager.send_media_sync_into(
+                layer_state['sysex_buf'], media_index, corrected_position_ms, state
             )
             
             layer_state['last_sent_time'] = current_time
             layer_state['last_sent_index'] = media_index
+            layer_state['last_sent_state'] = state
+            layer_state['last_sent_position'] = position
+    
+    def reset_sent_state(self):
+        """Forget what was sent to the Nowde (connect, HELLO): the next pass resends every layer"""
+        for layer_state in list(self.layers_state.values()):
+            with layer_state['lock']:
+                layer_state['last_sent_state'] = None
+                layer_state['last_sent_index'] = -1
+    
+    def update_layers(self, layers):
+        """Run one sync pass over all tracked layers (continuous sync tick)
+        
+        The Nowde firmware only understands single-layer 0x10 frames, so each
+        layer still gets its own frame, but the whole tick is one pass over a
+        snapshot of the layers dict (the OSC thread may add layers meanwhile).
+        """
+        for layer_name, layer_data in list(layers.items()):
+            self.update_layer(
+                layer_name=layer_name,
+                filename=layer_data["filename"],
+                position=layer_data["position"],
+                duration=layer_data["duration"],
+                state=layer_data["state"]
+            )
     
     def set_throttle_interval(self, interval):
         """Update throttle interval (in seconds)"""
@@ -162,6 +339,7 @@ class MilluBridge:
         else:
             self.config_file = None
             self.config = self.get_default_config()
+        self.config_save_timer = None  # Pending write-behind save (see schedule_config_save)
         
         # OSC address is always 0.0.0.0 to listen on all interfaces
         self.osc_address = "0.0.0.0"
@@ -175,14 +353,19 @@ class MilluBridge:
         self.dali_manager = DaliManager(status_callback=self.on_dali_status_changed)
         self.selected_port = None
         self.is_running = False
-        self.last_osc_time = 0
-        self.status_check_thread = None
-        self.midi_refresh_thread = None
-        self.media_sync_thread = None
-        self.running_state_thread = None
-        self.stop_midi_refresh = False
-        self.stop_media_sync = False
-        self.stop_running_state = False
+        self.last_osc_time = 0  # monotonic time of the last OSC message
+        self.osc_status_active = False  # Indicator state last shown by check_osc_status
+        self.last_osc_status = None  # (active, is_running, port) last rendered by update_osc_status
+        self.last_nowde_status = None  # (connected, device_name) last rendered by update_nowde_status
+        self.midi_tx_queue = queue.Queue()  # (send, args, on_result) posted by GUI callbacks
+        self.midi_tx_thread = None
+        self.scheduler_thread = None  # Media sync, RUNNING_STATE queries and MIDI port polling
+        self.stop_scheduler = threading.Event()
+        self.scheduler_wakeup = threading.Event()  # Set to re-plan now (MIDI hotplug, media events) or to exit (quit)
+        self.media_sync_requested = False  # Set by the OSC thread: run a media sync pass at once
+        self.last_midi_ports = None  # (output ports, input ports) seen by the last poll
+        self.midi_hotplug_observer = None  # pyudev observer (Linux), None when polling only
+        self.midi_hotplug_at = None  # monotonic time of the last unhandled hotplug event
         self.current_nowde_device = None
         self.sender_initialized = False  # Set to True after receiving HELLO
         
@@ -191,33 +374,71 @@ class MilluBridge:
         
         # Millumin layer tracking
         self.layers = {}  # {layer_name: {state, filename, position, duration}}
-        self.layer_rows = {}  # {layer_name: row_tag} - track row tags for updates
+        self.layer_rows = {}  # {layer_name: (row, state, filename, position, duration) item IDs}
+        self._row_text_cache = {}  # {item_tag: text} - last value pushed to table cells
+        self._row_color_cache = {}  # {item_tag: color or theme} - last color/theme pushed to table cells
+        self.layer_state_themes = {}  # {state (None = default): theme ID} - text colors of layer state cells
         self.show_all_messages = False
         
+        # Log ring buffers (appended from any thread, rendered once per GUI frame)
+        # They are the only copy of the logs: the text widgets are written, never read back,
+        # and keep their "Waiting for..." placeholder until the first line is flushed
+        self.osc_log_lines = deque(maxlen=LOG_MAX_LINES)
+        self.nowde_log_lines = deque(maxlen=LOG_MAX_LINES)
+        self.osc_log_dirty = False
+        self.nowde_log_dirty = False
+        self.osc_logs_visible = False  # Log panes are hidden by default
+        self.nowde_logs_visible = False
+        self.last_log_flush = 0.0  # monotonic time of last log pane redraw
+        self.log_lock = threading.Lock()  # Protect log buffers between producers and the GUI flush
+        self.log_timestamp = (0, "")  # (epoch second, "[HH:MM:SS]") reused for lines within a second
+        
+        # Widget updates queued by worker threads, applied on the GUI thread once per frame
+        self.ui_queue = deque()
+        
         # Lights tracking
         self.lights = {}  # {channel: value} - track light channel values
         self.light_rows = {}  # {channel: row_tag} - track row tags for updates
         self.dali_channels_present = {}  # {channel: bool} - track if DALI channel is responding
         self.dali_scan_thread = None
-        self.stop_dali_scan = False
+        self.stop_dali_scan = threading.Event()
+        self.dali_scan_wakeup = threading.Event()  # Set to scan now (DALI connected) or to exit (quit)
         self.lights_lock = threading.Lock()  # Protect lights table updates
         
         # Remote Nowdes tracking
         self.remote_nowdes = {}  # {mac: {name, version, layer}}
-        self.remote_nowdes_last_update = {}  # {mac: timestamp} - track when we last received update from Nowde
+        self.remote_nowdes_last_update = {}  # {mac: monotonic time} - track when we last received update from Nowde
         self.running_state_session = None  # Aggregate chunked RUNNING_STATE responses
+        self.running_state_generation = 0  # Incremented per applied RUNNING_STATE (missing-device sweep)
+        self.remote_row_signatures = {}  # {mac: (uuid, version, state, index, layer)} - last rendered row content
+        self.remote_table_last_refresh = 0.0  # monotonic time of last table refresh
+        self.remote_table_dirty = False  # Set by model changes, consumed by the GUI frame loop
+        self.nowde_row_tags = {}  # {mac: (row, uuid, version, state, index, layer_btn, sim_combo) tags}
+        self.remote_expiry_heap = []  # [(monotonic expiry, mac)] - one entry per displayed row
         
         # Layer editing modal state
         self.editing_layer_mac = None  # Track which device is being edited
+        self.custom_input_timer = None  # Debounce timer for the custom layer input
+        self.sorted_layer_names = []  # sorted(self.layers), republished by the OSC thread when a layer is added
+        self.display_layer_names = []  # Case-insensitive order for the layers table, republished likewise
+        self.layers_table_dirty = False  # Set on layer changes, consumed by the GUI frame loop
+        self.lights_table_dirty = False  # Set on light value/presence changes, consumed likewise
+        self.dirty_layers = set()  # Layers whose row needs a refresh (added by the OSC thread, popped by the GUI)
+        self.layer_time_marked_at = {}  # {layer_name: monotonic time} - last /media/time that marked the row
         
         # Simulation state
         self.simulation_settings = {
             'mac': {}  # {mac: 'Disabled' | 'Stop' | '1'-'10'}
         }
+        self.simulated_layers = frozenset()  # Layers simulated by a Remote Nowde (see refresh_simulated_layers)
+        self.simulating_macs = frozenset()  # Remote Nowdes with a simulation mode other than Disabled
         self.simulation_clock_running = False
         self.simulation_clock_duration = 30.0  # seconds
         self.simulation_clock_position = 0.0  # current position
+        self.simulation_clock_started_at = 0.0  # monotonic time of position 0
+        self.simulation_sync_buffers = {}  # {layer_name: reusable media sync SysEx frame}
         self.simulation_clock_thread = None
+        self.sim_clock_period_changed = False  # Set by on_throttle_changed, picked up by the clock loop
         self.stop_simulation_clock = False
         
         # Media synchronization settings (configurable)
@@ -234,6 +455,21 @@ class MilluBridge:
                                           self,
                                           throttle_interval=self.sync_settings['throttle_interval'])
         
+        # Tags of live DPG items, mirrored on creation/deletion to avoid does_item_exist FFI calls
+        self.gui_tags = set()
+        
+        # Integer item IDs of always-present widgets updated from hot paths (skip alias lookups)
+        self.status_indicator_id = None
+        self.status_text_id = None
+        self.fw_progress_id = None
+        self.fw_status_id = None
+        self.sim_clock_position_id = None
+        self.nowde_status_indicator_id = None
+        self.osc_log_text_id = None
+        self.osc_log_window_id = None
+        self.nowde_log_text_id = None
+        self.nowde_log_window_id = None
+        
         # Create DearPyGUI context
         dpg.create_context()
         
@@ -243,15 +479,16 @@ class MilluBridge:
         
         # Setup window
         self.setup_gui()
+        self.gui_tags.update(dpg.get_aliases())
+        self.gui_tags.update((self.status_indicator_id, self.status_text_id, self.fw_progress_id,
+                              self.fw_status_id, self.sim_clock_position_id))
         
-        # Start MIDI device refresh thread
-        self.start_midi_refresh_thread()
+        # Start scheduler thread (MIDI device refresh, media sync, running state queries)
+        self.start_midi_hotplug_monitor()
+        self.start_scheduler_thread()
         
-        # Start media sync thread for continuous updates
-        self.start_media_sync_thread()
-        
-        # Start running state query thread
-        self.start_running_state_thread()
+        # Start MIDI writer thread (SysEx sends requested by GUI callbacks)
+        self.start_midi_tx_thread()
         
         # Start DALI scan thread for channel detection
         self.start_dali_scan_thread()
@@ -331,6 +568,28 @@ class MilluBridge:
             }
         }
     
+    def schedule_config_save(self):
+        """Save config.json once changes stop for CONFIG_SAVE_DELAY (slider drags write once)"""
+        if not PERSIST_SETTINGS:
+            return
+        if self.config_save_timer is not None:
+            self.config_save_timer.cancel()
+        self.config_save_timer = threading.Timer(CONFIG_SAVE_DELAY, self._save_config_now)
+        self.config_save_timer.daemon = True
+        self.config_save_timer.start()
+    
+    def _save_config_now(self):
+        """Timer callback of schedule_config_save"""
+        self.config_save_timer = None
+        self.save_config()
+    
+    def flush_config_save(self):
+        """Write a pending scheduled save immediately (on quit)"""
+        timer = self.config_save_timer
+        if timer is not None:
+            timer.cancel()
+            self._save_config_now()
+    
     def save_config(self):
         """Save current configuration to config.json"""
         if not PERSIST_SETTINGS:
@@ -357,6 +616,8 @@ class MilluBridge:
 
     def setup_gui(self):
         """Setup the DearPyGUI interface"""
+        self.create_layer_state_themes()
+        
         with dpg.window(label="MilluBridge - OSC to MIDI Bridge", tag="primary_window", 
                        width=900, height=700, no_close=True):
             
@@ -376,8 +637,8 @@ class MilluBridge:
             # OSC Status indicator
             with dpg.group(horizontal=True):
                 dpg.add_text("OSC Status:", tag="status_label")
-                dpg.add_text("[X]", tag="status_indicator", color=(255, 0, 0))  # Red by default
-                dpg.add_text("", tag="status_text", color=(150, 150, 150))
+                self.status_indicator_id = dpg.add_text("[X]", tag="status_indicator", color=(255, 0, 0))  # Red by default
+                self.status_text_id = dpg.add_text("", tag="status_text", color=(150, 150, 150))
                 dpg.add_button(label="Show Logs", tag="osc_logs_toggle_btn", callback=self.toggle_osc_logs, width=100)
             
             # OSC setup note (shown when not receiving)
@@ -431,8 +692,8 @@ class MilluBridge:
                                    callback=self.on_toggle_filter, default_value=False)
                 
                 # Use child window for auto-scrolling log
-                with dpg.child_window(tag="osc_log_window", width=-1, height=150, border=True):
-                    dpg.add_text("Waiting for OSC messages...", tag="osc_log_text", wrap=850)
+                with dpg.child_window(tag="osc_log_window", width=-1, height=150, border=True) as self.osc_log_window_id:
+                    self.osc_log_text_id = dpg.add_text("Waiting for OSC messages...", tag="osc_log_text", wrap=850)
             
             dpg.add_separator()
             
@@ -478,7 +739,7 @@ class MilluBridge:
                     
                     with dpg.group(horizontal=True):
                         dpg.add_text("USB Status:")
-                        dpg.add_text("[X]", tag="nowde_status_indicator", color=(255, 0, 0))  # Red by default
+                        self.nowde_status_indicator_id = dpg.add_text("[X]", tag="nowde_status_indicator", color=(255, 0, 0))  # Red by default
                         dpg.add_text("Not connected", tag="nowde_status_text", color=(150, 150, 150))
                         dpg.add_button(label="Show Logs", tag="nowde_logs_toggle_btn", callback=self.toggle_nowde_logs, width=100)
                     
@@ -489,9 +750,9 @@ class MilluBridge:
                         dpg.add_spacer(width=20)
                         dpg.add_button(label="Upgrade Firmware", tag="upgrade_nowde_btn",
                                      callback=self.upgrade_nowde_firmware, width=150)
-                    dpg.add_progress_bar(tag="firmware_upload_progress", 
-                                        default_value=0.0, width=-1, show=False)
-                    dpg.add_text("", tag="firmware_upload_status", color=(150, 150, 150))
+                    self.fw_progress_id = dpg.add_progress_bar(tag="firmware_upload_progress", 
+                                                               default_value=0.0, width=-1, show=False)
+                    self.fw_status_id = dpg.add_text("", tag="firmware_upload_status", color=(150, 150, 150))
                 
                 # Right 1/3 - Dali Master section
                 with dpg.child_window(width=-1, height=120, border=False):
@@ -519,8 +780,8 @@ class MilluBridge:
                 dpg.add_text("Nowde Logs", color=(150, 200, 255))
                 
                 # Use child window for auto-scrolling log
-                with dpg.child_window(tag="midi_log_window", width=-1, height=150, border=True):
-                    dpg.add_text("Waiting for Nowde messages...", tag="midi_log_text", wrap=850)
+                with dpg.child_window(tag="midi_log_window", width=-1, height=150, border=True) as self.nowde_log_window_id:
+                    self.nowde_log_text_id = dpg.add_text("Waiting for Nowde messages...", tag="midi_log_text", wrap=850)
             
             dpg.add_separator()
             
@@ -554,7 +815,7 @@ class MilluBridge:
                 dpg.add_text("Stopped", tag="sim_clock_status", color=(150, 150, 150))
                 dpg.add_spacer(width=10)
                 dpg.add_text("Position:")
-                dpg.add_text("0.0s / 30.0s", tag="sim_clock_position_text", color=(150, 150, 150))
+                self.sim_clock_position_id = dpg.add_text("0.0s / 30.0s", tag="sim_clock_position_text", color=(150, 150, 150))
             
             # RF Simulation control
             with dpg.group(horizontal=True):
@@ -584,16 +845,20 @@ class MilluBridge:
             
             self.log_nowde_message(f"HELLO: v{version}, Boot reason: {boot_reason}")
             
-            # Update firmware version display
-            dpg.set_value("firmware_version_text", version)
-            dpg.configure_item("firmware_version_text", color=(100, 255, 100))  # Green when connected
+            # Update firmware version display (next GUI frame: this runs on the MIDI listener thread)
+            self.ui_set("firmware_version_text", version)
+            self.ui_configure("firmware_version_text", color=(100, 255, 100))  # Green when connected
             
             # Mark sender as initialized
             self.sender_initialized = True
             
+            # A (re)booted Nowde knows nothing of the layers: resend them all, idle ones included
+            self.media_sync.reset_sent_state()
+            self.request_media_sync()
+            
             # Clear stale state
             self.remote_nowdes.clear()
-            self.update_remote_nowdes_table()
+            self.mark_remote_nowdes_changed()
             
             # Push our config to sender (don't query again - we already did that)
             if self.current_nowde_device and self.output_manager.current_port:
@@ -601,34 +866,36 @@ class MilluBridge:
                 rf_sim_enabled = self.config['sender_config']['rf_simulation_enabled']
                 rf_sim_max_delay = self.config['sender_config']['rf_simulation_max_delay_ms']
                 
-                result = self.output_manager.send_push_full_config(rf_sim_enabled, rf_sim_max_delay)
-                if result and result[0]:
-                    success, formatted_msg = result
-                    self.log_nowde_message(f"TX: {formatted_msg}")
-                    self.update_osc_log("Sender initialized - config pushed")
+                def on_config_pushed(result):
+                    if result and result[0]:
+                        success, formatted_msg = result
+                        self.log_nowde_message(f"TX: {formatted_msg}")
+                        self.update_osc_log("Sender initialized - config pushed")
                 
-                # Query running state to get receiver table
-                time.sleep(0.1)
-                result = self.output_manager.send_query_running_state()
-                if result and result[0]:
-                    success, formatted_msg = result
-                    self.log_nowde_message(f"TX: {formatted_msg}")
+                def on_state_queried(result):
+                    if result and result[0]:
+                        success, formatted_msg = result
+                        self.log_nowde_message(f"TX: {formatted_msg}")
+                
+                # Both sends go through the MIDI TX thread, in order, so the listener thread
+                # never waits on the port; the sender settles before the receiver table query
+                self.post_midi_tx(self.output_manager.send_push_full_config,
+                                  (rf_sim_enabled, rf_sim_max_delay), on_config_pushed)
+                self.post_midi_tx(self.send_query_running_state_settled, (), on_state_queried)
         
         elif msg_type == 'config_state':
             # Update config from sender's response
             self.config['sender_config']['rf_simulation_enabled'] = data['rf_simulation_enabled']
             self.config['sender_config']['rf_simulation_max_delay_ms'] = data['rf_simulation_max_delay_ms']
             
-            # Update GUI if RF sim checkbox exists
-            if dpg.does_item_exist("rf_sim_checkbox"):
-                dpg.set_value("rf_sim_checkbox", data['rf_simulation_enabled'])
+            # Update GUI (drain_ui_queue skips it if the RF sim checkbox does not exist)
+            self.ui_set("rf_sim_checkbox", data['rf_simulation_enabled'])
             
             # Log
             self.update_osc_log(f"Config received from sender: RF Sim={'ON' if data['rf_simulation_enabled'] else 'OFF'}")
         
         elif msg_type == 'running_state':
-            import time
-            current_time = time.time()
+            current_time = time.monotonic()
 
             total_receivers = data.get('total_receivers', len(data['receivers']))
             chunk_index = data.get('chunk_index', 0)
@@ -683,7 +950,7 @@ class MilluBridge:
             # Log error from Nowde
             error_msg = f"Nowde Error: {data['error_name']} (0x{data['error_code']:02X})"
             if data['context_bytes']:
-                error_msg += f" Context: {' '.join(f'{b:02X}' for b in data['context_bytes'])}"
+                error_msg += f" Context: {data['context_bytes'].hex(' ').upper()}"
             self.update_osc_log(error_msg)
             self.log_nowde_message(f"ERROR: {error_msg}")
         
@@ -691,13 +958,20 @@ class MilluBridge:
             # Log received SysEx in human-readable format
             self.log_nowde_message(f"RX: {data}")
     
+    def send_query_running_state_settled(self):
+        """MIDI TX thread job: give the sender SENDER_INIT_SETTLE after the HELLO config push, then query RUNNING_STATE"""
+        time.sleep(SENDER_INIT_SETTLE)
+        if not (self.current_nowde_device and self.output_manager.current_port):
+            return False
+        return self.output_manager.send_query_running_state()
+    
     def _apply_running_state_receivers(self, receivers, current_time, mesh_synced, uptime_s, total_receivers):
         """Apply a fully aggregated RUNNING_STATE update to the remote Nowde table."""
-        received_macs = set()
+        remote_nowdes = self.remote_nowdes
         receiver_count = len(receivers)
 
         # Only log detailed receiver info if count changed
-        if receiver_count != len(self.remote_nowdes):
+        if receiver_count != len(remote_nowdes):
             print(
                 f"\n[DEBUG] RUNNING_STATE: {receiver_count} receivers from Nowde"
                 + (f" (expected {total_receivers})" if receiver_count != total_receivers else "")
@@ -709,29 +983,31 @@ class MilluBridge:
                     f"Active: {receiver['active']}, MediaIdx: {receiver['media_index']}"
                 )
 
+        # Tag entries with this update's generation instead of building a set of received MACs
+        self.running_state_generation += 1
+        generation = self.running_state_generation
+
+        last_update = self.remote_nowdes_last_update
         for receiver in receivers:
-            self.remote_nowdes[receiver['mac']] = receiver
-            self.remote_nowdes_last_update[receiver['mac']] = current_time
-            received_macs.add(receiver['mac'])
+            mac = receiver['mac']
+            receiver['_generation'] = generation
+            remote_nowdes[mac] = receiver
+            last_update[mac] = current_time
 
         # For devices not present in this update, increment their last_seen_ms so UI ageing works
-        for mac in list(self.remote_nowdes.keys()):
-            if mac not in received_macs:
-                # Store the base time when device first went missing (don't overwrite if already set)
-                if '_base_last_seen_ms' not in self.remote_nowdes[mac]:
-                    self.remote_nowdes[mac]['_base_last_seen_ms'] = self.remote_nowdes[mac].get('last_seen_ms', 0)
-                    self.remote_nowdes[mac]['_missing_since'] = current_time
-                
-                # Calculate elapsed time since device first went missing
-                missing_since = self.remote_nowdes[mac].get('_missing_since', current_time)
-                elapsed_ms = int((current_time - missing_since) * 1000)
-                
-                # Update last_seen_ms = base + elapsed
-                base_last_seen = self.remote_nowdes[mac]['_base_last_seen_ms']
-                self.remote_nowdes[mac]['last_seen_ms'] = base_last_seen + elapsed_ms
+        # (snapshot: the GUI thread drops expired entries from remote_nowdes meanwhile)
+        for nowde in list(remote_nowdes.values()):
+            if nowde['_generation'] == generation:
+                continue
+            # When a device first goes missing, store the moment it was last seen
+            # (now - last_seen_ms); afterwards ageing is a single subtraction
+            seen_at = nowde.get('_last_seen_at')
+            if seen_at is None:
+                seen_at = nowde['_last_seen_at'] = current_time - nowde.get('last_seen_ms', 0) / 1000.0
+            nowde['last_seen_ms'] = int((current_time - seen_at) * 1000)
 
         # Update GUI (handles 15-minute removal logic)
-        self.update_remote_nowdes_table()
+        self.mark_remote_nowdes_changed()
 
         mesh_status = "SYNCED" if mesh_synced else "NOT SYNCED"
         self.update_osc_log(
@@ -752,13 +1028,15 @@ class MilluBridge:
             return
         
         # Send Change Receiver Layer SysEx
-        result = self.output_manager.send_change_receiver_layer(mac_address, new_layer)
-        if result and result[0]:
-            success, formatted_msg = result
-            self.update_osc_log(f"Sent Change Receiver Layer: MAC={mac_address}, Layer={new_layer}")
-            self.log_nowde_message(f"TX: {formatted_msg}")
-        else:
-            self.update_osc_log("Error: Failed to send Change Receiver Layer command")
+        def on_result(result):
+            if result and result[0]:
+                success, formatted_msg = result
+                self.update_osc_log(f"Sent Change Receiver Layer: MAC={mac_address}, Layer={new_layer}")
+                self.log_nowde_message(f"TX: {formatted_msg}")
+            else:
+                self.update_osc_log("Error: Failed to send Change Receiver Layer command")
+        
+        self.post_midi_tx(self.output_manager.send_change_receiver_layer, (mac_address, new_layer), on_result)
     
     def open_layer_editor(self, mac_address):
         """Open modal dialog to edit layer for a specific Nowde"""
@@ -768,8 +1046,7 @@ class MilluBridge:
         current_layer = self.remote_nowdes.get(mac_address, {}).get('layer', '')
         
         # Create or show modal window
-        if dpg.does_item_exist("layer_editor_modal"):
-            dpg.delete_item("layer_editor_modal")
+        self.close_layer_editor()
         
         with dpg.window(label="Edit Layer", tag="layer_editor_modal", modal=True, 
                        width=400, height=400, pos=[250, 150], no_resize=True):
@@ -780,7 +1057,7 @@ class MilluBridge:
             dpg.add_text("Custom Layer Name:")
             dpg.add_input_text(tag="layer_custom_input", default_value=current_layer, 
                              width=-1,
-                             callback=lambda s, a: self.on_custom_input_changed(s, a))
+                             callback=self.on_custom_input_changed)
             
             dpg.add_text("(Press Enter or click Apply to confirm)", color=(150, 150, 150))
             
@@ -788,42 +1065,59 @@ class MilluBridge:
             dpg.add_text("Or select from Millumin layers:")
             
             # Add listbox with Millumin layers
-            layer_names = sorted(list(self.layers.keys()))
+            layer_names = self.get_sorted_layer_names()
             # Add "-" as first option for "no layer"
             listbox_items = ["-"] + layer_names
             dpg.add_listbox(tag="layer_listbox", items=listbox_items, 
                           num_items=min(8, len(listbox_items)),
                           width=-1,
                           default_value="-",  # Default to "no layer"
-                          callback=lambda s, a: self.select_layer_from_list(a))
+                          callback=self.select_layer_from_list)
             
             dpg.add_separator()
             
             # Buttons
             with dpg.group(horizontal=True):
                 dpg.add_button(label="Apply", width=180, 
-                             callback=lambda: self.apply_layer_edit_from_modal())
+                             callback=self.apply_layer_edit_from_modal)
                 dpg.add_button(label="Cancel", width=180, 
-                             callback=lambda: dpg.delete_item("layer_editor_modal"))
+                             callback=self.close_layer_editor)
+        
+        self.gui_tags.update(LAYER_EDITOR_TAGS)
+    
+    def close_layer_editor(self):
+        """Delete the layer editor modal if open"""
+        if self.custom_input_timer is not None:
+            self.custom_input_timer.cancel()
+            self.custom_input_timer = None
+        if "layer_editor_modal" in self.gui_tags:
+            dpg.delete_item("layer_editor_modal")
+            self.gui_tags.difference_update(LAYER_EDITOR_TAGS)
+    
+    def get_sorted_layer_names(self):
+        """Return Millumin layer names sorted (republished when a new layer appears)"""
+        return self.sorted_layer_names
     
     def on_custom_input_changed(self, sender, app_data):
-        """When user types in custom input, clear listbox selection"""
-        # Clear listbox selection when typing (app_data is the current text value)
-        if dpg.does_item_exist("layer_listbox"):
-            # Get current layers to check if typed value matches one
-            layer_names = sorted(list(self.layers.keys()))
-            if app_data not in layer_names:
-                # Only clear if the typed value doesn't match a layer exactly
-                # Setting to empty list item index or invalid value deselects
-                try:
-                    dpg.set_value("layer_listbox", "")
-                except:
-                    pass
+        """When user types in custom input, clear listbox selection (debounced per keystroke burst)"""
+        if self.custom_input_timer is not None:
+            self.custom_input_timer.cancel()
+        self.custom_input_timer = threading.Timer(0.15, self._apply_custom_input_changed, args=(app_data,))
+        self.custom_input_timer.daemon = True
+        self.custom_input_timer.start()
+    
+    def _apply_custom_input_changed(self, text):
+        """Clear listbox selection unless the typed text matches a layer exactly (timer thread)"""
+        self.custom_input_timer = None
+        if text not in self.layers:
+            # Only clear if the typed value doesn't match a layer exactly
+            # Setting an invalid value deselects; drain_ui_queue skips it if the editor closed
+            self.ui_set("layer_listbox", "")
     
-    def select_layer_from_list(self, layer_name):
+    def select_layer_from_list(self, sender, app_data):
         """When user clicks on a layer in the listbox, update the input field"""
-        if dpg.does_item_exist("layer_custom_input"):
-            dpg.set_value("layer_custom_input", layer_name)
+        if "layer_custom_input" in self.gui_tags:
+            dpg.set_value("layer_custom_input", app_data)
     
     def apply_layer_edit_from_modal(self):
         """Apply the layer change from the modal dialog"""
@@ -831,11 +1125,10 @@ class MilluBridge:
             return
         
         # Get the new layer value from input
-        new_layer = dpg.get_value("layer_custom_input") if dpg.does_item_exist("layer_custom_input") else ""
+        new_layer = dpg.get_value("layer_custom_input") if "layer_custom_input" in self.gui_tags else ""
         
         # Close modal
-        if dpg.does_item_exist("layer_editor_modal"):
-            dpg.delete_item("layer_editor_modal")
+        self.close_layer_editor()
         
         # Apply the change
         if new_layer:
@@ -850,162 +1143,265 @@ class MilluBridge:
             return full_name.split(':', 1)[0]
         return full_name
     
+    def _set_cell_text(self, tag, text):
+        """Set a table cell value (tag or item ID), skipping the DPG call when the text is unchanged"""
+        if self._row_text_cache.get(tag) != text:
+            dpg.set_value(tag, text)
+            self._row_text_cache[tag] = text
+    
+    def _set_cell_color(self, tag, color):
+        """Set a table cell color, skipping the DPG call when the color is unchanged"""
+        if self._row_color_cache.get(tag) != color:
+            dpg.configure_item(tag, color=color)
+            self._row_color_cache[tag] = color
+    
+    def _set_cell_theme(self, item, theme):
+        """Bind a theme to a table cell, skipping the DPG call when it is already bound"""
+        if self._row_color_cache.get(item) != theme:
+            dpg.bind_item_theme(item, theme)
+            self._row_color_cache[item] = theme
+    
+    def create_layer_state_themes(self):
+        """Create one text color theme per layer state, bound to state cells on state changes"""
+        for state, color in (*LAYER_STATE_COLORS.items(), (None, LAYER_STATE_DEFAULT_COLOR)):
+            with dpg.theme() as theme:
+                with dpg.theme_component(dpg.mvText):
+                    dpg.add_theme_color(dpg.mvThemeCol_Text, color)
+            self.layer_state_themes[state] = theme
+    
+    def _get_nowde_row_tags(self, mac):
+        """Return the item tags of a Remote Nowde row, built once per MAC"""
+        tags = self.nowde_row_tags.get(mac)
+        if tags is None:
+            tags = self.nowde_row_tags[mac] = tuple(
+                prefix + mac for prefix in ("nowde_row_", "nowde_uuid_", "nowde_version_", "nowde_state_",
+                                            "nowde_index_", "layer_btn_", "sim_combo_")
+            )
+        return tags
+    
+    def _forget_nowde_row(self, mac):
+        """Drop tags and cached cell values of a deleted Remote Nowde row"""
+        tags = self.nowde_row_tags.pop(mac, None) or ()
+        for tag in tags[1:5]:  # uuid, version, state, index cells
+            self._row_text_cache.pop(tag, None)
+            self._row_color_cache.pop(tag, None)
+        self.gui_tags.difference_update(tags)
+        self.remote_row_signatures.pop(mac, None)
+    
+    def _on_layer_btn_clicked(self, sender, app_data, user_data):
+        """Layer button callback (user_data is the row's MAC)"""
+        self.open_layer_editor(user_data)
+    
+    def _on_sim_combo_changed(self, sender, app_data, user_data):
+        """Simulation combo callback (user_data is the row's MAC)"""
+        self.on_simulation_mode_changed(user_data, app_data)
+    
+    def mark_remote_nowdes_changed(self):
+        """Record a remote Nowdes change; the table is re-rendered on the next GUI frame"""
+        # Device list or layer assignments may have changed
+        self.refresh_simulated_layers()
+        self.remote_table_dirty = True
+    
+    def refresh_tables(self):
+        """Re-render tables whose model changed (GUI thread, once per frame)
+        
+        Model changes only set dirty flags, so UI work follows the frame rate rather
+        than the OSC/MIDI event rate. The Remote Nowdes table is also capped at
+        REMOTE_TABLE_MIN_INTERVAL.
+        """
+        if self.layers_table_dirty:
+            self.layers_table_dirty = False
+            self.update_layers_table()
+        
+        if self.lights_table_dirty:
+            self.lights_table_dirty = False
+            self.update_lights_table()
+        
+        if self.remote_table_dirty:
+            now = time.monotonic()
+            if now - self.remote_table_last_refresh >= REMOTE_TABLE_MIN_INTERVAL:
+                self.remote_table_last_refresh = now
+                self.remote_table_dirty = False
+                self.update_remote_nowdes_table()
+    
     def update_remote_nowdes_table(self):
-        """Update the Remote Nowdes table in the GUI"""
-        if not dpg.does_item_exist("remote_nowdes_table"):
+        """Update the Remote Nowdes table in the GUI (see refresh_tables)"""
+        if "remote_nowdes_table" not in self.gui_tags:
             return
         
-        # Track which rows we've seen (to remove stale ones after 15 min)
-        seen_macs = set(self.remote_nowdes.keys())
-        existing_rows = set()
-        
-        # Initialize simulation settings for new devices
-        for mac in seen_macs:
-            if mac not in self.simulation_settings['mac']:
-                self.simulation_settings['mac'][mac] = 'Disabled'
-        
-        # Get existing rows
-        children = dpg.get_item_children("remote_nowdes_table", slot=1)
-        if children:
-            for child in children:
-                # Extract MAC from row tag (format: "nowde_row_AA:BB:CC:DD:EE:FF")
-                tag = dpg.get_item_alias(child)
-                if tag and tag.startswith("nowde_row_"):
-                    mac = tag[10:]  # Remove "nowde_row_" prefix
-                    
-                    # If USB midi sender is disconnected, clear all rows immediately
-                    if len(seen_macs) == 0:
-                        dpg.delete_item(child)
+        now = time.monotonic()
+        
+        # One DPG mutex hold for the whole batch: the render thread never sees a half-updated table
+        with dpg.mutex():
+            # Initialize simulation settings for new devices
+            # (snapshot: the MIDI thread may update remote_nowdes meanwhile)
+            for mac in list(self.remote_nowdes):
+                if mac not in self.simulation_settings['mac']:
+                    self.simulation_settings['mac'][mac] = 'Disabled'
+        
+            # Displayed rows are exactly the MACs with a rendered signature
+            existing_rows = self.remote_row_signatures
+            expiry_heap = self.remote_expiry_heap
+        
+            if not self.remote_nowdes:
+                # If USB midi sender is disconnected, clear all rows immediately
+                for mac in list(existing_rows):
+                    dpg.delete_item(self._get_nowde_row_tags(mac)[0])
+                    self._forget_nowde_row(mac)
+                expiry_heap.clear()
+            else:
+                # Only look at rows whose 15-minute deadline has passed
+                while expiry_heap and expiry_heap[0][0] <= now:
+                    _, mac = heapq.heappop(expiry_heap)
+                    if mac not in existing_rows:
                         continue
-                    
-                    # For devices in the dict, check if they've been GONE for 15 minutes
-                    if mac in seen_macs:
-                        nowde = self.remote_nowdes[mac]
+                    nowde = self.remote_nowdes.get(mac)
+                    if nowde is not None:
                         last_seen_ms = nowde.get('last_seen_ms', 0)
-                        # Remove if GONE (>10s) for more than 15 minutes total (900000ms)
-                        if last_seen_ms > 900000:  # 15 minutes since last seen
-                            dpg.delete_item(child)
-                            # Also remove from dict to stop tracking it
-                            del self.remote_nowdes[mac]
-                        else:
-                            existing_rows.add(mac)
-        
-        # Update or add rows for each remote Nowde, sorted by UUID
-        for mac, nowde in sorted(self.remote_nowdes.items(), key=lambda x: x[1].get('uuid', '')):
-            # Determine colors based on last seen time (3-state)
-            active = nowde.get('active', True)
-            last_seen_ms = nowde.get('last_seen_ms', 0)
-            media_index = nowde.get('media_index', 0)
-            
-            if active and last_seen_ms < 3000:  # < 3s = ACTIVE
-                state_text = "ACTIVE"
-                state_color = (0, 255, 0)  # Green
-                text_color = (255, 255, 255)
-            elif last_seen_ms < 10000:  # 3s-10s = MISSING (matches ESP32 removal timeout)
-                state_text = "MISSING"
-                state_color = (255, 255, 0)  # Yellow
-                text_color = (200, 200, 150)
-            else:  # > 10s = GONE
-                state_text = "GONE"
-                state_color = (255, 0, 0)  # Red
-                text_color = (150, 80, 80)
-            
-            row_tag = f"nowde_row_{mac}"
-            uuid_tag = f"nowde_uuid_{mac}"
-            version_tag = f"nowde_version_{mac}"
-            state_tag = f"nowde_state_{mac}"
-            index_tag = f"nowde_index_{mac}"
-            layer_btn_tag = f"layer_btn_{mac}"
-            sim_combo_tag = f"sim_combo_{mac}"
-            
-            if mac in existing_rows:
-                # Update existing row
-                if dpg.does_item_exist(uuid_tag):
-                    dpg.set_value(uuid_tag, nowde['uuid'])
-                    dpg.configure_item(uuid_tag, color=text_color)
-                if dpg.does_item_exist(version_tag):
-                    dpg.set_value(version_tag, nowde.get('version', '?'))
-                    dpg.configure_item(version_tag, color=text_color)
-                if dpg.does_item_exist(state_tag):
-                    dpg.set_value(state_tag, state_text)
-                    dpg.configure_item(state_tag, color=state_color)
-                if dpg.does_item_exist(index_tag):
-                    index_str = str(media_index) if media_index > 0 else "-"
-                    dpg.set_value(index_tag, index_str)
-                    dpg.configure_item(index_tag, color=text_color)
-                if dpg.does_item_exist(layer_btn_tag):
-                    dpg.configure_item(layer_btn_tag, label=nowde.get('layer', '-'))
-                # Simulation combo is handled by callback, no need to update
-            else:
-                # Create new row
-                sim_options = ['Disabled', 'Stop'] + [str(i) for i in range(1, 11)]
-                current_sim = self.simulation_settings['mac'].get(mac, 'Disabled')
+                        if last_seen_ms <= REMOTE_NOWDE_EXPIRY_MS:
+                            # Seen again since the entry was pushed: reschedule
+                            heapq.heappush(expiry_heap, (now + (REMOTE_NOWDE_EXPIRY_MS - last_seen_ms) / 1000.0, mac))
+                            continue
+                        # GONE (>10s) for more than 15 minutes: also stop tracking it
+                        del self.remote_nowdes[mac]
+                        self.refresh_simulated_layers()
+                    dpg.delete_item(self._get_nowde_row_tags(mac)[0])
+                    self._forget_nowde_row(mac)
+        
+            # Update or add rows for each remote Nowde, sorted by UUID
+            # (snapshot: the MIDI thread may add receivers meanwhile)
+            for mac, nowde in sorted(list(self.remote_nowdes.items()), key=lambda x: x[1].get('uuid', '')):
+                # Determine colors based on last seen time (3-state)
+                active = nowde.get('active', True)
+                last_seen_ms = nowde.get('last_seen_ms', 0)
+                media_index = nowde.get('media_index', 0)
+            
+                if active and last_seen_ms < 3000:  # < 3s = ACTIVE
+                    state_text = "ACTIVE"
+                    state_color = (0, 255, 0)  # Green
+                    text_color = (255, 255, 255)
+                elif last_seen_ms < 10000:  # 3s-10s = MISSING (matches ESP32 removal timeout)
+                    state_text = "MISSING"
+                    state_color = (255, 255, 0)  # Yellow
+                    text_color = (200, 200, 150)
+                else:  # > 10s = GONE
+                    state_text = "GONE"
+                    state_color = (255, 0, 0)  # Red
+                    text_color = (150, 80, 80)
+            
+                row_tags = self._get_nowde_row_tags(mac)
+                row_tag, uuid_tag, version_tag, state_tag, index_tag, layer_btn_tag, sim_combo_tag = row_tags
+            
+                index_str = str(media_index) if media_index > 0 else "-"
+                layer_label = nowde.get('layer', '-')
+                signature = (nowde['uuid'], nowde.get('version', '?'), state_text, index_str, layer_label)
+            
+                if mac in existing_rows:
+                    # Skip rows whose rendered content did not change
+                    if self.remote_row_signatures.get(mac) == signature:
+                        continue
+                    self.remote_row_signatures[mac] = signature
                 
-                with dpg.table_row(parent="remote_nowdes_table", tag=row_tag):
-                    dpg.add_text(nowde['uuid'], tag=uuid_tag, color=text_color)
-                    dpg.add_text(nowde.get('version', '?'), tag=version_tag, color=text_color)
-                    dpg.add_text(state_text, tag=state_tag, color=state_color)
-                    index_str = str(media_index) if media_index > 0 else "-"
-                    dpg.add_text(index_str, tag=index_tag, color=text_color)
-                    dpg.add_button(
-                        tag=layer_btn_tag,
-                        label=nowde.get('layer', '-'),
-                        width=140,
-                        callback=lambda s, a, u: self.open_layer_editor(u['mac']),
-                        user_data={'mac': mac}
-                    )
-                    dpg.add_combo(
-                        tag=sim_combo_tag,
-                        items=sim_options,
-                        default_value=current_sim,
-                        width=90,
-                        callback=lambda s, a, u: self.on_simulation_mode_changed(u['mac'], a),
-                        user_data={'mac': mac}
-                    )
+                    # Update existing row
+                    if uuid_tag in self.gui_tags:
+                        self._set_cell_text(uuid_tag, nowde['uuid'])
+                        self._set_cell_color(uuid_tag, text_color)
+                    if version_tag in self.gui_tags:
+                        self._set_cell_text(version_tag, nowde.get('version', '?'))
+                        self._set_cell_color(version_tag, text_color)
+                    if state_tag in self.gui_tags:
+                        self._set_cell_text(state_tag, state_text)
+                        self._set_cell_color(state_tag, state_color)
+                    if index_tag in self.gui_tags:
+                        self._set_cell_text(index_tag, index_str)
+                        self._set_cell_color(index_tag, text_color)
+                    if layer_btn_tag in self.gui_tags:
+                        dpg.configure_item(layer_btn_tag, label=layer_label)
+                    # Simulation combo is handled by callback, no need to update
+                else:
+                    # Create new row
+                    current_sim = self.simulation_settings['mac'].get(mac, 'Disabled')
+                
+                    self.remote_row_signatures[mac] = signature
+                    heapq.heappush(expiry_heap, (now + (REMOTE_NOWDE_EXPIRY_MS - last_seen_ms) / 1000.0, mac))
+                    cache = self._row_text_cache
+                    cache[uuid_tag] = nowde['uuid']
+                    cache[version_tag] = nowde.get('version', '?')
+                    cache[state_tag] = state_text
+                    cache[index_tag] = index_str
+                    self._row_color_cache.update({
+                        uuid_tag: text_color, version_tag: text_color,
+                        state_tag: state_color, index_tag: text_color
+                    })
+                
+                    with dpg.table_row(parent="remote_nowdes_table", tag=row_tag):
+                        dpg.add_text(cache[uuid_tag], tag=uuid_tag, color=text_color)
+                        dpg.add_text(cache[version_tag], tag=version_tag, color=text_color)
+                        dpg.add_text(state_text, tag=state_tag, color=state_color)
+                        dpg.add_text(index_str, tag=index_tag, color=text_color)
+                        dpg.add_button(
+                            tag=layer_btn_tag,
+                            label=layer_label,
+                            width=140,
+                            callback=self._on_layer_btn_clicked,
+                            user_data=mac
+                        )
+                        dpg.add_combo(
+                            tag=sim_combo_tag,
+                            items=SIM_OPTIONS,
+                            default_value=current_sim,
+                            width=90,
+                            callback=self._on_sim_combo_changed,
+                            user_data=mac
+                        )
+                    self.gui_tags.update(row_tags)
         
         # Auto-manage simulation clock based on current remote states
         # (e.g., if all simulating devices disconnected, stop the clock)
         self._auto_manage_simulation_clock()
     
-    def handle_osc_message(self, message):
-        self.last_osc_time = time.time()
-        self.update_osc_status(True)
-        
-        # Parse Millumin messages (layers)
-        is_millumin = self.parse_millumin_message(message)
-        
-        # Parse light messages
-        is_light = self.parse_light_message(message)
+    def handle_osc_message(self, address, args):
+        self.last_osc_time = time.monotonic()
+        
+        # Classify by address prefix once: each message goes to at most one parser
+        if address.startswith("/millumin/layer:"):
+            # Parse Millumin messages (layers)
+            handled = self.parse_millumin_message(address, args)
+        elif address.startswith("/L"):
+            # Parse light messages
+            handled = self.parse_light_message(address, args)
+        else:
+            handled = False
         
-        # Log message (filtered or all)
-        if self.show_all_messages or is_millumin or is_light:
-            self.update_osc_log(message)
+        # Log message (filtered or all) - only the log view needs the text form
+        if handled or self.show_all_messages:
+            self.update_osc_log(f"{address}: {args}")
+    
+    def refresh_simulated_layers(self):
+        """Rebuild the sets of simulating remotes and simulated layers
+        
+        Called whenever simulation modes or remote Nowdes (and their layers) change,
+        so the OSC hot path and the simulation clock only do set lookups.
+        """
+        sim_modes = self.simulation_settings['mac']
+        simulating = {
+            mac: nowde for mac, nowde in list(self.remote_nowdes.items())
+            if sim_modes.get(mac, 'Disabled') != 'Disabled'
+        }
+        self.simulating_macs = frozenset(simulating)
+        self.simulated_layers = frozenset(nowde.get('layer') for nowde in simulating.values())
     
     def is_layer_in_simulation(self, layer_name):
         """Check if any Remote Nowde is simulating this layer"""
-        for mac, nowde in self.remote_nowdes.items():
-            if nowde.get('layer') == layer_name:
-                sim_mode = self.simulation_settings['mac'].get(mac, 'Disabled')
-                if sim_mode != 'Disabled':
-                    return True
-        return False
+        return layer_name in self.simulated_layers
     
-    def parse_light_message(self, message):
+    def parse_light_message(self, address, args):
         """Parse light OSC messages and update light tracking"""
-        # Message format: "/L1: (255,)" or "/L1: 255" or "/L1 255"
-        if not message.startswith("/L"):
+        # Message format: "/L1" with args (255,)
+        if not address.startswith("/L"):
             return False
         
         try:
-            # Split address and value
-            # Handle both formats: "/L1: 255" and "/L1 255"
-            if ": " in message:
-                address, value_str = message.split(": ", 1)
-            elif " " in message:
-                address, value_str = message.split(" ", 1)
-            else:
-                return False
-            
             # Extract channel number from /L<channel>
             channel_str = address[2:]  # Skip "/L"
             
@@ -1015,16 +1411,13 @@ class MilluBridge:
             except ValueError:
                 return False
             
-            # Parse value (remove parentheses, commas, and whitespace)
-            value_str = value_str.strip().strip("()").strip(",").strip()
-            
             # Handle empty value
-            if not value_str:
+            if not args:
                 return False
             
             try:
-                value = int(float(value_str))  # Convert to int (handles both int and float strings)
-            except ValueError:
+                value = int(float(args[0]))  # Convert to int (handles int, float and numeric strings)
+            except (TypeError, ValueError):
                 return False
             
             # Clamp value to 0-255 range
@@ -1032,6 +1425,7 @@ class MilluBridge:
             
             # Update lights dictionary (thread-safe)
             with self.lights_lock:
+                changed = self.lights.get(channel) != value
                 self.lights[channel] = value
             
             # Immediately push to DALI if connected
@@ -1040,8 +1434,9 @@ class MilluBridge:
                 if 0 <= dali_address <= 63:
                     self.dali_manager.set_level(dali_address, value)
             
-            # Update UI table
-            self.update_lights_table()
+            # Update UI table (next GUI frame, only when the value changed)
+            if changed:
+                self.lights_table_dirty = True
             
             return True
             
@@ -1049,115 +1444,63 @@ class MilluBridge:
             # If parsing fails, it's not a valid light message
             return False
     
-    def parse_millumin_message(self, message):
+    def parse_millumin_message(self, address, args):
         """Parse Millumin OSC messages and update layer tracking"""
-        # Message format: "/millumin/layer:player2/media/time: (60.70, 596.45)"
-        if not message.startswith("/millumin/layer:"):
+        # Message format: "/millumin/layer:player2/media/time" with args (60.70, 596.45)
+        if not address.startswith("/millumin/layer:"):
             return False
         
         try:
-            # Split address and args by ": "
-            if ": " not in message:
-                return False
-            
-            address, args_str = message.split(": ", 1)
-            
-            # Extract layer name from /millumin/layer:<name>/rest/of/path
-            # Remove "/millumin/layer:" prefix
-            path = address[16:]  # Skip "/millumin/layer:"
-            
-            # Split by first "/" to get layer name and route
-            if "/" not in path:
+            # One find, two slices: "/millumin/layer:" is 16 chars, the route keeps its "/"
+            slash = address.find("/", 17)
+            if slash < 0 or slash == len(address) - 1:
                 return False
-            
-            layer_name, route = path.split("/", 1)
-            route = "/" + route  # Add back the leading slash
+            layer_name = address[16:slash]
+            route = address[slash:]
             
             # Check if this layer is being simulated - if so, discard real messages
             if self.is_layer_in_simulation(layer_name):
                 # Silently ignore real OSC for simulated layers
                 return True  # Return True to indicate message was "handled" (by ignoring it)
             
-            # Parse arguments - remove parentheses and split by comma
-            args_str = args_str.strip().strip("()")
-            if args_str:
-                # Split by comma and convert to appropriate types
-                args = []
-                for arg in args_str.split(","):
-                    arg = arg.strip()
-                    # Try to parse as number
-                    try:
-                        if "." in arg:
-                            args.append(float(arg))
-                        else:
-                            args.append(int(arg))
-                    except ValueError:
-                        # It's a string, remove quotes if present
-                        args.append(arg.strip("'\""))
-                args = tuple(args)
-            else:
-                args = ()
-            
-            # Initialize layer if not exists
-            if layer_name not in self.layers:
-                self.layers[layer_name] = {
+            # Initialize layer if not exists (one dict lookup for known layers)
+            layer = self.layers.get(layer_name)
+            if layer is None:
+                layer = self.layers[layer_name] = {
                     "state": "stopped",
                     "filename": "",
                     "position": 0.0,
                     "duration": 0.0
                 }
+                # Publish the new orders from here (the only thread adding layers), so
+                # a reader never caches a sort that missed this layer
+                self.sorted_layer_names = sorted(self.layers)
+                self.display_layer_names = sorted(self.layers, key=str.lower)
+            
+            previous_state = layer["state"]
+            
+            # Handle different routes (args are the typed values from the OSC packet)
+            handler = MILLUMIN_ROUTE_HANDLERS.get(route)
+            if handler:
+                handler(layer, args)
+            
+            # /media/time only moves the position: the continuous sync tick covers it.
+            # Start/stop events go out at once, but from the scheduler thread, so the
+            # OSC thread never waits on the MIDI port (events in a burst share one pass)
+            if self.current_nowde_device and route != "/media/time":
+                self.request_media_sync()
+            
+            # Position-only updates refresh the row at LAYER_TIME_UI_INTERVAL at most
+            # (self.layers always holds the latest values); state changes show right away
+            if route == "/media/time" and layer["state"] == previous_state:
+                now = time.monotonic()
+                if now - self.layer_time_marked_at.get(layer_name, 0.0) < LAYER_TIME_UI_INTERVAL:
+                    return True
+                self.layer_time_marked_at[layer_name] = now
             
-            layer = self.layers[layer_name]
-            
-            # Handle different routes
-            if route == "/media/time" and len(args) >= 2:
-                layer["position"] = float(args[0])
-                layer["duration"] = float(args[1])
-                # Only set state to playing if we have a filename (media has started)
-                # This prevents sending mediaIndex=0 when /media/time arrives before /mediaStarted
-                if layer["filename"]:
-                    layer["state"] = "playing"
-            
-            elif route == "/mediaStarted" and len(args) >= 2:
-                # mediaStarted format: (index, filename, duration)
-                layer["filename"] = str(args[1]) if len(args) > 1 else ""
-                layer["duration"] = float(args[2]) if len(args) > 2 else 0.0
-                layer["position"] = 0.0
-                layer["state"] = "playing"
-            
-            elif route == "/mediaStopped" and len(args) >= 2:
-                # mediaStopped format: (index, filename, duration)
-                stopped_filename = str(args[1]) if len(args) > 1 else ""
-                
-                # Only apply stop if the stopped filename matches current playing filename
-                # This prevents old mediaStopped messages from stopping newly started media
-                # when switching media without explicit stop (Millumin behavior)
-                if layer["filename"] == stopped_filename or layer["filename"] == "":
-                    layer["filename"] = ""
-                    layer["duration"] = 0.0
-                    layer["position"] = 0.0
-                    layer["state"] = "stopped"
-                # else: ignore - a new media is already playing
-            
-            # Send to media sync manager (only if we have valid state)
-            # Skip sending if state=stopped and we have no filename (prevents spurious updates)
-            if self.current_nowde_device:
-                # Only send updates when:
-                # 1. Playing with a valid filename, OR
-                # 2. Stopped (to signal stop)
-                should_send = (layer["state"] == "playing" and layer["filename"]) or (layer["state"] == "stopped")
-                
-                if should_send:
-                    self.media_sync.update_layer(
-                        layer_name=layer_name,
-                        filename=layer["filename"],
-                        position=layer["position"],
-                        duration=layer["duration"],
-                        state=layer["state"]
-                    )
-            
-            # Update UI table
-            self.update_layers_table()
+            # Update UI table (next GUI frame, this row only)
+            self.dirty_layers.add(layer_name)
+            self.layers_table_dirty = True
             return True
             
         except Exception as e:
@@ -1165,180 +1508,175 @@ class MilluBridge:
             return False
 
     def update_osc_log(self, message):
-        """Update the OSC log display with auto-scroll"""
-        if dpg.does_item_exist("osc_log_text"):
-            current_log = dpg.get_value("osc_log_text")
-            
-            # Clear initial message on first real message
-            if current_log.strip() == "Waiting for OSC messages...":
-                current_log = ""
-            
-            new_log = current_log + f"{message}\n"
-            
-            # Keep only last 1000 lines
-            lines = new_log.split('\n')
-            if len(lines) > 1000:
-                new_log = '\n'.join(lines[-1000:])
-            
-            dpg.set_value("osc_log_text", new_log)
-            
-            # Auto-scroll to bottom
-            if dpg.does_item_exist("osc_log_window"):
-                # Get the y scroll max and set it to scroll to bottom
-                dpg.set_y_scroll("osc_log_window", dpg.get_y_scroll_max("osc_log_window"))
+        """Queue a line for the OSC log display (rendered on the next GUI frame)"""
+        with self.log_lock:
+            self.osc_log_lines.append(message)
+            self.osc_log_dirty = True
     
     def update_layers_table(self):
-        """Update the Millumin layers table without clearing and recreating"""
-        if not dpg.does_item_exist("layers_table"):
+        """Update the Millumin layers table without clearing and recreating
+        
+        Existing rows are only refreshed when their layer was marked in dirty_layers.
+        """
+        if "layers_table" not in self.gui_tags:
             return
         
-        # Get current layers (excluding simulated ones), sorted alphabetically
-        current_layers = sorted(
-            [(name, data) for name, data in self.layers.items() if not self.is_layer_in_simulation(name)],
-            key=lambda x: x[0].lower()
-        )
-        current_layer_names = [name for name, _ in current_layers]
-        existing_layer_names = [name for name in self.layer_rows.keys() if not self.is_layer_in_simulation(name)]
-        
-        # Check if we need to rebuild the table (new layer or order changed)
-        needs_rebuild = current_layer_names != existing_layer_names
-        
-        if needs_rebuild:
-            # Clear all existing rows
-            for layer_name in list(self.layer_rows.keys()):
-                row_tag = f"layer_row_{layer_name}"
-                if dpg.does_item_exist(row_tag):
-                    dpg.delete_item(row_tag)
-            self.layer_rows.clear()
-        
-        # Update or add rows for each layer, sorted alphabetically
-        for layer_name, layer_data in current_layers:
-            row_tag = f"layer_row_{layer_name}"
-            
-            if layer_name not in self.layer_rows:
-                # Create new row
-                with dpg.table_row(parent="layers_table", tag=row_tag):
-                    dpg.add_text(layer_name, tag=f"{row_tag}_name")
-                    
-                    # State with color
+        # Take the marked layers before reading their data: a later change marks them again
+        dirty = self.dirty_layers
+        refresh = set()
+        while dirty:
+            refresh.add(dirty.pop())
+        
+        # Batch all row updates under one DPG mutex hold
+        with dpg.mutex():
+            # Get current layers (excluding simulated ones), sorted alphabetically
+            # The order only changes when a layer is added: the OSC thread publishes it then
+            ordered_names = self.display_layer_names
+            simulated = self.simulated_layers
+            layers = self.layers
+            current_layers = [(name, layers[name]) for name in ordered_names if name not in simulated]
+            current_layer_names = [name for name, _ in current_layers]
+            existing_layer_names = [name for name in self.layer_rows if name not in simulated]
+        
+            # Check if we need to rebuild the table (new layer or order changed)
+            needs_rebuild = current_layer_names != existing_layer_names
+        
+            if needs_rebuild:
+                # Clear all existing rows
+                for row_id, state_id, *cell_ids in self.layer_rows.values():
+                    dpg.delete_item(row_id)
+                    for cell_id in (state_id, *cell_ids):
+                        self._row_text_cache.pop(cell_id, None)
+                    self._row_color_cache.pop(state_id, None)
+                self.layer_rows.clear()
+        
+            # Update or add rows for each layer, sorted alphabetically
+            themes = self.layer_state_themes
+            labels = LAYER_STATE_LABELS
+            for layer_name, layer_data in current_layers:
+                row_ids = self.layer_rows.get(layer_name)
+            
+                if row_ids is None:
+                    # Create new row (cells are then addressed by the item IDs DPG returns)
                     state = layer_data["state"]
-                    color = (0, 255, 0) if state == "playing" else (150, 150, 150)
-                    dpg.add_text(state.upper(), tag=f"{row_tag}_state", color=color)
-                    
-                    dpg.add_text(layer_data["filename"], tag=f"{row_tag}_filename")
-                    dpg.add_text(f"{layer_data['position']:.2f}s", tag=f"{row_tag}_position")
-                    dpg.add_text(f"{layer_data['duration']:.2f}s", tag=f"{row_tag}_duration")
-                
-                self.layer_rows[layer_name] = row_tag
-            else:
-                # Update existing row
-                state = layer_data["state"]
-                if state == "playing": color = (0, 255, 0)
-                elif state == "paused": color = (255, 255, 0)
-                elif state == "stopped": color = (255, 0, 0)
-                else: color = (150, 150, 150)
-                
-                if dpg.does_item_exist(f"{row_tag}_state"):
-                    dpg.set_value(f"{row_tag}_state", state.upper())
-                    dpg.configure_item(f"{row_tag}_state", color=color)
-                
-                if dpg.does_item_exist(f"{row_tag}_filename"):
-                    dpg.set_value(f"{row_tag}_filename", layer_data["filename"])
-                
-                if dpg.does_item_exist(f"{row_tag}_position"):
-                    dpg.set_value(f"{row_tag}_position", f"{layer_data['position']:.2f}s")
+                    theme = themes["playing"] if state == "playing" else themes[None]
+                    cells = (
+                        labels.get(state) or state.upper(),
+                        layer_data["filename"],
+                        f"{layer_data['position']:.2f}s",
+                        f"{layer_data['duration']:.2f}s"
+                    )
+                    with dpg.table_row(parent="layers_table") as row_id:
+                        dpg.add_text(layer_name)
+                        state_id = dpg.add_text(cells[0])
+                        cell_ids = (state_id, dpg.add_text(cells[1]), dpg.add_text(cells[2]), dpg.add_text(cells[3]))
+                    self._row_text_cache.update(zip(cell_ids, cells))
+                    self._set_cell_theme(state_id, theme)
                 
-                if dpg.does_item_exist(f"{row_tag}_duration"):
-                    dpg.set_value(f"{row_tag}_duration", f"{layer_data['duration']:.2f}s")
+                    self.layer_rows[layer_name] = (row_id, *cell_ids)
+                elif layer_name in refresh:
+                    # Update existing row
+                    row_id, state_id, filename_id, position_id, duration_id = row_ids
+                    state = layer_data["state"]
+                    self._set_cell_text(state_id, labels.get(state) or state.upper())
+                    self._set_cell_theme(state_id, themes.get(state, themes[None]))
+                    self._set_cell_text(filename_id, layer_data["filename"])
+                    self._set_cell_text(position_id, f"{layer_data['position']:.2f}s")
+                    self._set_cell_text(duration_id, f"{layer_data['duration']:.2f}s")
     
     def update_lights_table(self):
-        """Update the Lights table - always rebuild for consistency"""
-        if not dpg.does_item_exist("lights_table"):
+        """Update the Lights table - always rebuild for consistency (see refresh_tables)"""
+        if "lights_table" not in self.gui_tags:
             return
         
-        with self.lights_lock:
-            # Always clear and rebuild to avoid stale state issues
-            for channel in list(self.light_rows.keys()):
+        # Delete and rebuild under one DPG mutex hold so the table never renders empty
+        with dpg.mutex():
+            with self.lights_lock:
+                # Always clear and rebuild to avoid stale state issues
+                for channel in list(self.light_rows.keys()):
+                    row_tag = f"light_row_{channel}"
+                    if row_tag in self.gui_tags:
+                        dpg.delete_item(row_tag)
+                    self.gui_tags.difference_update(row_tag + suffix for suffix in LIGHT_ROW_SUFFIXES)
+                self.light_rows.clear()
+            
+                # Take snapshots of current state
+                declared_channels = dict(self.lights)  # {channel: value}
+                presence_status = dict(self.dali_channels_present)  # {channel: bool}
+        
+            # Collect detected-only channels (from DALI scan, present but not declared)
+            detected_only_channels = set()
+            for channel, is_present in presence_status.items():
+                if is_present and channel not in declared_channels and 1 <= channel <= 16:
+                    detected_only_channels.add(channel)
+        
+            # Sort: declared channels first, then detected-only at bottom
+            declared_sorted = sorted(declared_channels.keys())
+            detected_sorted = sorted(detected_only_channels)
+        
+            # Add declared channels (normal display)
+            for channel in declared_sorted:
+                value = declared_channels[channel]
+                row_tag = f"light_row_{channel}"
+            
+                # Get DALI presence status for this channel
+                is_present = presence_status.get(channel, None)
+                if is_present is None:
+                    status_text = "..."
+                    status_color = (150, 150, 150)
+                elif is_present:
+                    status_text = "OK"
+                    status_color = (0, 255, 0)
+                else:
+                    status_text = "No Response"
+                    status_color = (255, 165, 0)
+            
+                with dpg.table_row(parent="lights_table", tag=row_tag):
+                    # Clickable channel name for identify
+                    dpg.add_button(
+                        label=f"L{channel}", 
+                        tag=f"{row_tag}_channel",
+                        callback=self._on_identify_clicked,
+                        user_data=channel,
+                        width=-1
+                    )
+                    dpg.add_text(str(value), tag=f"{row_tag}_value")
+                    dpg.add_text(status_text, tag=f"{row_tag}_status", color=status_color)
+            
+                self.gui_tags.update(row_tag + suffix for suffix in LIGHT_ROW_SUFFIXES)
+                self.light_rows[channel] = row_tag
+        
+            # Add detected-only channels at bottom (greyed display, no value)
+            for channel in detected_sorted:
                 row_tag = f"light_row_{channel}"
-                if dpg.does_item_exist(row_tag):
-                    dpg.delete_item(row_tag)
-            self.light_rows.clear()
-            
-            # Take snapshots of current state
-            declared_channels = dict(self.lights)  # {channel: value}
-            presence_status = dict(self.dali_channels_present)  # {channel: bool}
-        
-        # Collect detected-only channels (from DALI scan, present but not declared)
-        detected_only_channels = set()
-        for channel, is_present in presence_status.items():
-            if is_present and channel not in declared_channels and 1 <= channel <= 16:
-                detected_only_channels.add(channel)
-        
-        # Sort: declared channels first, then detected-only at bottom
-        declared_sorted = sorted(declared_channels.keys())
-        detected_sorted = sorted(detected_only_channels)
-        
-        # Add declared channels (normal display)
-        for channel in declared_sorted:
-            value = declared_channels[channel]
-            row_tag = f"light_row_{channel}"
-            
-            # Get DALI presence status for this channel
-            is_present = presence_status.get(channel, None)
-            if is_present is None:
-                status_text = "..."
-                status_color = (150, 150, 150)
-            elif is_present:
+            
+                # These are always present (that's why they're in detected_only)
                 status_text = "OK"
                 status_color = (0, 255, 0)
-            else:
-                status_text = "No Response"
-                status_color = (255, 165, 0)
-            
-            with dpg.table_row(parent="lights_table", tag=row_tag):
-                # Clickable channel name for identify
-                dpg.add_button(
-                    label=f"L{channel}", 
-                    tag=f"{row_tag}_channel",
-                    callback=lambda s, a, u: self.identify_channel(u),
-                    user_data=channel,
-                    width=-1
-                )
-                dpg.add_text(str(value), tag=f"{row_tag}_value")
-                dpg.add_text(status_text, tag=f"{row_tag}_status", color=status_color)
-            
-            self.light_rows[channel] = row_tag
-        
-        # Add detected-only channels at bottom (greyed display, no value)
-        for channel in detected_sorted:
-            row_tag = f"light_row_{channel}"
-            
-            # These are always present (that's why they're in detected_only)
-            status_text = "OK"
-            status_color = (0, 255, 0)
-            
-            with dpg.table_row(parent="lights_table", tag=row_tag):
-                # Clickable channel name for identify (greyed style)
-                dpg.add_button(
-                    label=f"L{channel}", 
-                    tag=f"{row_tag}_channel",
-                    callback=lambda s, a, u: self.identify_channel(u),
-                    user_data=channel,
-                    width=-1
-                )
-                dpg.bind_item_theme(f"{row_tag}_channel", "greyed_button_theme") if dpg.does_item_exist("greyed_button_theme") else None
-                dpg.add_text("", tag=f"{row_tag}_value")
-                dpg.add_text(status_text, tag=f"{row_tag}_status", color=status_color)
             
-            self.light_rows[channel] = row_tag
+                with dpg.table_row(parent="lights_table", tag=row_tag):
+                    # Clickable channel name for identify (greyed style)
+                    dpg.add_button(
+                        label=f"L{channel}", 
+                        tag=f"{row_tag}_channel",
+                        callback=self._on_identify_clicked,
+                        user_data=channel,
+                        width=-1
+                    )
+                    dpg.bind_item_theme(f"{row_tag}_channel", "greyed_button_theme") if "greyed_button_theme" in self.gui_tags else None
+                    dpg.add_text("", tag=f"{row_tag}_value")
+                    dpg.add_text(status_text, tag=f"{row_tag}_status", color=status_color)
+            
+                self.gui_tags.update(row_tag + suffix for suffix in LIGHT_ROW_SUFFIXES)
+                self.light_rows[channel] = row_tag
     
     def on_toggle_filter(self, sender, app_data):
         """Toggle between showing all messages or only Millumin messages"""
-        self.show_all_messages = dpg.get_value("show_all_toggle")
+        self.show_all_messages = app_data  # Checkbox state, no get_value round trip
     
     def toggle_osc_logs(self):
         """Toggle visibility of OSC logs section"""
-        if dpg.does_item_exist("osc_logs_section"):
+        if "osc_logs_section" in self.gui_tags:
             is_visible = dpg.is_item_shown("osc_logs_section")
             if is_visible:
                 dpg.hide_item("osc_logs_section")
@@ -1346,10 +1684,11 @@ class MilluBridge:
             else:
                 dpg.show_item("osc_logs_section")
                 dpg.set_value("osc_logs_toggle_btn", "Hide Logs")
+            self.osc_logs_visible = not is_visible
     
     def toggle_nowde_logs(self):
         """Toggle visibility of Nowde logs section"""
-        if dpg.does_item_exist("nowde_logs_section"):
+        if "nowde_logs_section" in self.gui_tags:
             is_visible = dpg.is_item_shown("nowde_logs_section")
             if is_visible:
                 dpg.hide_item("nowde_logs_section")
@@ -1357,37 +1696,91 @@ class MilluBridge:
             else:
                 dpg.show_item("nowde_logs_section")
                 dpg.set_value("nowde_logs_toggle_btn", "Hide Logs")
+            self.nowde_logs_visible = not is_visible
     
     def log_nowde_message(self, message):
         """Log Nowde communication message (including SysEx)"""
-        if dpg.does_item_exist("midi_log_text"):
-            current_log = dpg.get_value("midi_log_text")
-            
-            # Clear initial message on first real message
-            if current_log.strip() == "Waiting for Nowde messages...":
-                current_log = ""
-            
-            timestamp = time.strftime("%H:%M:%S")
-            new_log = current_log + f"[{timestamp}] {message}\n"
-            
-            # Keep only last 1000 lines
-            lines = new_log.split('\n')
-            if len(lines) > 1000:
-                new_log = '\n'.join(lines[-1000:])
-            
-            dpg.set_value("midi_log_text", new_log)
-            
-            # Auto-scroll to bottom
-            if dpg.does_item_exist("midi_log_window"):
-                dpg.set_y_scroll("midi_log_window", dpg.get_y_scroll_max("midi_log_window"))
+        second = int(time.time())
+        cached_second, timestamp = self.log_timestamp
+        if second != cached_second:
+            timestamp = time.strftime("[%H:%M:%S]", time.localtime(second))
+            self.log_timestamp = (second, timestamp)
+        with self.log_lock:
+            self.nowde_log_lines.append(f"{timestamp} {message}")
+            self.nowde_log_dirty = True
+    
+    def ui_set(self, tag, value):
+        """Queue dpg.set_value from a worker thread (applied by drain_ui_queue)"""
+        self.ui_queue.append((dpg.set_value, tag, value))
+    
+    def ui_configure(self, tag, **kwargs):
+        """Queue dpg.configure_item from a worker thread (applied by drain_ui_queue)"""
+        self.ui_queue.append((dpg.configure_item, tag, kwargs))
+    
+    def ui_call(self, job, *args):
+        """Queue a GUI-thread job from a worker thread (run by drain_ui_queue)"""
+        self.ui_queue.append((job, None, args))
+    
+    def drain_ui_queue(self):
+        """Apply widget updates queued by worker threads (GUI thread, once per frame)"""
+        queue = self.ui_queue
+        while queue:
+            apply, tag, arg = queue.popleft()
+            if tag is None:
+                # ui_call job: an error must not stop the render loop
+                try:
+                    apply(*arg)
+                except Exception as e:
+                    print(f"Error in GUI job {getattr(apply, '__name__', apply)}: {e}")
+                continue
+            if tag not in self.gui_tags:
+                continue
+            if apply is dpg.set_value:
+                apply(tag, arg)
+            else:
+                apply(tag, **arg)
+    
+    def flush_logs(self, now):
+        """Render pending log lines into the log panes with auto-scroll (GUI thread, once per frame)
+        
+        now is the frame's time.monotonic() reading.
+        Redraws are capped at LOG_FLUSH_INTERVAL so bursts of lines share one join.
+        Hidden panes are skipped and stay dirty, so they render once when shown.
+        """
+        if now - self.last_log_flush < LOG_FLUSH_INTERVAL:
+            return
+        self.last_log_flush = now
+        
+        osc_text = nowde_text = None
+        with self.log_lock:
+            if self.osc_log_dirty and self.osc_logs_visible:
+                osc_text = '\n'.join(self.osc_log_lines)
+                self.osc_log_dirty = False
+            if self.nowde_log_dirty and self.nowde_logs_visible:
+                nowde_text = '\n'.join(self.nowde_log_lines)
+                self.nowde_log_dirty = False
+        
+        if osc_text is not None and self.osc_log_text_id is not None:
+            dpg.set_value(self.osc_log_text_id, osc_text)
+            # Auto-scroll to bottom (-1 scrolls to the max once the new text is laid out)
+            if self.osc_log_window_id is not None:
+                dpg.set_y_scroll(self.osc_log_window_id, -1.0)
+        
+        if nowde_text is not None and self.nowde_log_text_id is not None:
+            dpg.set_value(self.nowde_log_text_id, nowde_text)
+            # Auto-scroll to bottom (-1 scrolls to the max once the new text is laid out)
+            if self.nowde_log_window_id is not None:
+                dpg.set_y_scroll(self.nowde_log_window_id, -1.0)
     
     def refresh_midi_devices(self):
         """Refresh available Nowde devices and update dropdown"""
-        # Get all available ports (union of input and output)
+        # Get available Nowde ports (union of input and output, filtered before sorting)
         try:
-            out_ports = set(self.output_manager.get_ports())
-            in_ports = set(self.input_manager.get_ports())
-            all_ports = sorted(list(out_ports | in_ports))
+            out_ports = self.output_manager.get_ports()
+            in_ports = self.input_manager.get_ports()
+            all_ports = set(out_ports)
+            all_ports.update(in_ports)
+            nowde_devices = sorted(port for port in all_ports if port.startswith("Nowde"))
         except Exception as e:
             print(f"Error getting MIDI ports: {e}")
             # If we can't enumerate ports and had a device, assume disconnection
@@ -1395,11 +1788,8 @@ class MilluBridge:
                 self.disconnect_nowde_device()
             return
         
-        # Filter for Nowde devices
-        nowde_devices = [port for port in all_ports if port.startswith("Nowde")]
-        
         # Update combo box with available Nowde devices
-        if dpg.does_item_exist("nowde_device_combo"):
+        if "nowde_device_combo" in self.gui_tags:
             if nowde_devices:
                 # Create display names (short) and map them to full names
                 self.nowde_device_map = {}
@@ -1409,18 +1799,25 @@ class MilluBridge:
                     display_names.append(display_name)
                     self.nowde_device_map[display_name] = dev
                 
-                dpg.configure_item("nowde_device_combo", items=display_names)
-                # If connected device is still in the list, keep it selected
-                if self.current_nowde_device in nowde_devices:
-                    idx = nowde_devices.index(self.current_nowde_device)
-                    dpg.set_value("nowde_device_combo", display_names[idx])
-                # If no device connected, auto-connect to first available
-                elif not self.current_nowde_device:
-                    dpg.set_value("nowde_device_combo", display_names[0])
-                    self.connect_nowde_device(nowde_devices[0])
+                auto_connect = None
+                with dpg.mutex():
+                    dpg.configure_item("nowde_device_combo", items=display_names)
+                    # If connected device is still in the list, keep it selected
+                    if self.current_nowde_device in nowde_devices:
+                        idx = nowde_devices.index(self.current_nowde_device)
+                        dpg.set_value("nowde_device_combo", display_names[idx])
+                    # If no device connected, auto-connect to first available
+                    elif not self.current_nowde_device:
+                        dpg.set_value("nowde_device_combo", display_names[0])
+                        auto_connect = nowde_devices[0]
+                # Port I/O stays outside the DPG mutex
+                if auto_connect:
+                    # Reuse the indices of this enumeration rather than listing ports again
+                    self.connect_nowde_device(auto_connect, (out_ports, in_ports))
             else:
-                dpg.configure_item("nowde_device_combo", items=["No Nowde devices found"])
-                dpg.set_value("nowde_device_combo", "No Nowde devices found")
+                with dpg.mutex():
+                    dpg.configure_item("nowde_device_combo", items=["No Nowde devices found"])
+                    dpg.set_value("nowde_device_combo", "No Nowde devices found")
         
         # Check if currently connected device is still available
         if self.current_nowde_device:
@@ -1453,29 +1850,43 @@ class MilluBridge:
         # Connect to the selected device
         self.connect_nowde_device(selected_device)
     
-    def connect_nowde_device(self, device_name):
-        """Connect to a Nowde device"""
+    def connect_nowde_device(self, device_name, ports=None):
+        """Connect to a Nowde device
+        ports: (output ports, input ports) just returned by the managers' get_ports(), if any
+        """
         # Close existing ports and clear remote nowdes if switching devices
         if self.current_nowde_device and self.current_nowde_device != device_name:
             # Switching to a different device - clear remote nowdes table
             self.remote_nowdes.clear()
-            self.update_remote_nowdes_table()
+            self.mark_remote_nowdes_changed()
             self.update_osc_log(f"Switched from {self.current_nowde_device} to {device_name} - remote table cleared")
         
         self.output_manager.close_port()
         self.input_manager.close_port()
         
+        # Port indices from the caller's enumeration; None lets the manager look the name up
+        out_index = in_index = None
+        if ports is not None:
+            out_ports, in_ports = ports
+            if device_name in out_ports:
+                out_index = out_ports.index(device_name)
+            if device_name in in_ports:
+                in_index = in_ports.index(device_name)
+        
         # Open output for OSC→MIDI
-        out_success = self.output_manager.open_port(device_name)
+        out_success = self.output_manager.open_port(device_name, out_index)
         # Open input for monitoring
-        in_success = self.input_manager.open_port(device_name)
+        in_success = self.input_manager.open_port(device_name, in_index)
         
         if out_success or in_success:
             self.current_nowde_device = device_name
             self.selected_port = device_name
+            # The device may have missed frames while unplugged: resend every layer's state
+            self.media_sync.reset_sent_state()
+            self.request_media_sync()
             
             # Update combo box selection
-            if dpg.does_item_exist("nowde_device_combo"):
+            if "nowde_device_combo" in self.gui_tags:
                 dpg.set_value("nowde_device_combo", self.format_device_name(device_name))
             
             self.update_nowde_status(True, device_name)
@@ -1484,15 +1895,21 @@ class MilluBridge:
             # Send QUERY_CONFIG to trigger sender to send HELLO + CONFIG_STATE
             # This handles both fresh boot and reconnection scenarios
             if out_success:
-                time.sleep(0.1)  # Small delay for port to stabilize
-                result = self.output_manager.send_query_config()
-                if result and result[0]:
-                    success, formatted_msg = result
-                    self.log_nowde_message(f"TX: {formatted_msg}")
-                    self.update_osc_log("Sent QUERY_CONFIG, waiting for HELLO response...")
+                def on_result(result):
+                    if result and result[0]:
+                        success, formatted_msg = result
+                        self.log_nowde_message(f"TX: {formatted_msg}")
+                        self.update_osc_log("Sent QUERY_CONFIG, waiting for HELLO response...")
+                
+                self.post_midi_tx(self.send_query_config_settled, (), on_result)
         else:
             self.update_osc_log(f"Failed to connect to: {device_name}")
     
+    def send_query_config_settled(self):
+        """MIDI TX thread job: give a freshly opened port MIDI_PORT_SETTLE, then send QUERY_CONFIG"""
+        time.sleep(MIDI_PORT_SETTLE)
+        return self.output_manager.send_query_config()
+    
     def disconnect_nowde_device(self):
         """Disconnect from Nowde device"""
         if self.current_nowde_device:
@@ -1504,17 +1921,17 @@ class MilluBridge:
             self.sender_initialized = False  # Reset initialization flag
             
             # Reset firmware version display
-            if dpg.does_item_exist("firmware_version_text"):
+            if "firmware_version_text" in self.gui_tags:
                 dpg.set_value("firmware_version_text", "--")
                 dpg.configure_item("firmware_version_text", color=(150, 150, 150))
             
             # Clear remote nowdes table and tracking
             self.remote_nowdes.clear()
             self.remote_nowdes_last_update.clear()
-            self.update_remote_nowdes_table()
+            self.mark_remote_nowdes_changed()
             
             # Update combo box to show no selection
-            if dpg.does_item_exist("nowde_device_combo"):
+            if "nowde_device_combo" in self.gui_tags:
                 current_items = dpg.get_item_configuration("nowde_device_combo").get("items", [])
                 if current_items and current_items[0] != "No Nowde devices found":
                     dpg.set_value("nowde_device_combo", "")
@@ -1522,16 +1939,21 @@ class MilluBridge:
             self.update_nowde_status(False, None)
     
     def update_nowde_status(self, connected, device_name=None):
-        """Update the Nowde status indicator"""
-        if dpg.does_item_exist("nowde_status_indicator"):
+        """Update the Nowde status indicator (no-op when the shown state is unchanged)"""
+        status = (connected, device_name)
+        if status == self.last_nowde_status:
+            return
+        self.last_nowde_status = status
+        
+        if self.nowde_status_indicator_id is not None:
             if connected:
-                dpg.set_value("nowde_status_indicator", "[OK]")
-                dpg.configure_item("nowde_status_indicator", color=(0, 255, 0))
+                dpg.set_value(self.nowde_status_indicator_id, "[OK]")
+                dpg.configure_item(self.nowde_status_indicator_id, color=(0, 255, 0))
             else:
-                dpg.set_value("nowde_status_indicator", "[X]")
-                dpg.configure_item("nowde_status_indicator", color=(255, 0, 0))
+                dpg.set_value(self.nowde_status_indicator_id, "[X]")
+                dpg.configure_item(self.nowde_status_indicator_id, color=(255, 0, 0))
         
-        if dpg.does_item_exist("nowde_status_text"):
+        if "nowde_status_text" in self.gui_tags:
             if connected and device_name:
                 dpg.set_value("nowde_status_text", f"{self.format_device_name(device_name)}")
                 dpg.configure_item("nowde_status_text", color=(0, 255, 0))
@@ -1539,62 +1961,157 @@ class MilluBridge:
                 dpg.set_value("nowde_status_text", "Not connected")
                 dpg.configure_item("nowde_status_text", color=(150, 150, 150))
     
-    def start_midi_refresh_thread(self):
-        """Start background thread to auto-refresh MIDI devices"""
-        self.stop_midi_refresh = False
-        self.midi_refresh_thread = threading.Thread(target=self.auto_refresh_midi_devices, daemon=True)
-        self.midi_refresh_thread.start()
+    def start_midi_tx_thread(self):
+        """Start the background thread sending SysEx commands queued by GUI callbacks"""
+        if self.midi_tx_thread is None or not self.midi_tx_thread.is_alive():
+            self.midi_tx_thread = threading.Thread(target=self.midi_tx_loop, daemon=True)
+            self.midi_tx_thread.start()
+    
+    def post_midi_tx(self, send, args, on_result):
+        """Queue an output_manager send from the GUI thread; on_result(result) runs on the writer thread"""
+        self.midi_tx_queue.put((send, args, on_result))
+    
+    def midi_tx_loop(self):
+        """Background thread: run queued MIDI sends so port writes never stall the render loop"""
+        while True:
+            send, args, on_result = self.midi_tx_queue.get()
+            try:
+                result = send(*args)
+            except Exception as e:
+                print(f"Error sending MIDI: {e}")
+                result = False
+            on_result(result)
+    
+    def start_scheduler_thread(self):
+        """Start the background thread running the periodic Nowde jobs"""
+        self.stop_scheduler.clear()
+        self.scheduler_wakeup.clear()
+        self.scheduler_thread = threading.Thread(target=self.scheduler_loop, daemon=True)
+        self.scheduler_thread.start()
+        print("Scheduler thread started")
+    
+    def scheduler_loop(self):
+        """Background thread: media sync, running state queries and MIDI port polling
+        
+        One thread and one monotonic clock for all periodic jobs. It sleeps until
+        the next job is due; scheduler_wakeup cuts the sleep short on quit, on
+        media start/stop events (request_media_sync) and on MIDI hotplug events,
+        which are refreshed once they settled.
+        """
+        midi_refresh_interval = MIDI_HOTPLUG_POLL_INTERVAL if self.midi_hotplug_observer else MIDI_REFRESH_INTERVAL
+        now = time.monotonic()
+        next_sync = now
+        next_query = now
+        next_midi_refresh = now + midi_refresh_interval
+        
+        while True:
+            next_due = min(next_sync, next_query, next_midi_refresh)
+            hotplug_at = self.midi_hotplug_at
+            if hotplug_at is not None:
+                next_due = min(next_due, hotplug_at + MIDI_HOTPLUG_SETTLE)
+            self.scheduler_wakeup.wait(max(0.0, next_due - now))
+            self.scheduler_wakeup.clear()
+            if self.stop_scheduler.is_set():
+                break
+            now = time.monotonic()
+            
+            if now >= next_sync or self.media_sync_requested:
+                # Cleared first: an event arriving during this pass gets a pass of its own
+                self.media_sync_requested = False
+                next_sync = now + self.sync_settings['throttle_interval']
+                self.continuous_media_sync()
+            
+            if now >= next_query:
+                next_query = now + RUNNING_STATE_QUERY_INTERVAL
+                self.query_running_state()
+            
+            # A settled hotplug event refreshes right away
+            hotplug_at = self.midi_hotplug_at
+            if hotplug_at is not None and now - hotplug_at >= MIDI_HOTPLUG_SETTLE:
+                self.midi_hotplug_at = None
+                next_midi_refresh = now
+                # Port lists cached while the device was still (dis)appearing are stale
+                self.output_manager.invalidate_ports_cache()
+                self.input_manager.invalidate_ports_cache()
+            
+            if now >= next_midi_refresh:
+                next_midi_refresh = now + midi_refresh_interval
+                self.auto_refresh_midi_devices()
+            
+            now = time.monotonic()
     
-    def start_media_sync_thread(self):
-        """Start background thread to continuously send media sync packets"""
-        self.stop_media_sync = False
-        self.media_sync_thread = threading.Thread(target=self.continuous_media_sync, daemon=True)
-        self.media_sync_thread.start()
+    def request_media_sync(self):
+        """Have the scheduler run a media sync pass now (OSC thread, media start/stop)"""
+        self.media_sync_requested = True
+        self.scheduler_wakeup.set()
+    
+    def stop_scheduler_thread(self):
+        """Ask the scheduler thread to exit and wake it up if it is sleeping"""
+        self.stop_scheduler.set()
+        self.scheduler_wakeup.set()
+    
+    def check_osc_status(self, now):
+        """GUI loop job: flip the OSC indicator when traffic starts or stops
+        
+        Runs every frame on the GUI thread with the frame's time.monotonic() reading:
+        a compare, and the indicator is only touched on an edge.
+        """
+        active = self.is_running and now - self.last_osc_time <= OSC_STATUS_TIMEOUT
+        if active != self.osc_status_active:
+            self.osc_status_active = active
+            self.update_osc_status(active)
+    
+    def start_midi_hotplug_monitor(self):
+        """Refresh MIDI ports on sound device hotplug events instead of fast polling
+        
+        Linux only (pyudev); other platforms keep the MIDI_REFRESH_INTERVAL poll.
+        """
+        if not (PYUDEV_AVAILABLE and sys.platform.startswith('linux')):
+            return
+        try:
+            context = pyudev.Context()
+            monitor = pyudev.Monitor.from_netlink(context)
+            # USB MIDI ports appear/disappear with their ALSA sound device
+            monitor.filter_by('sound')
+            self.midi_hotplug_observer = pyudev.MonitorObserver(monitor, callback=self._on_midi_hotplug)
+            self.midi_hotplug_observer.start()
+            print("MIDI hotplug monitor started")
+        except Exception as e:
+            print(f"Warning: MIDI hotplug monitor unavailable, polling instead: {e}")
+            self.midi_hotplug_observer = None
+    
+    def _on_midi_hotplug(self, device):
+        """pyudev observer callback (observer thread): picked up by the scheduler"""
+        self.midi_hotplug_at = time.monotonic()
+        self.scheduler_wakeup.set()
     
     def continuous_media_sync(self):
-        """Background thread to continuously send sync packets for all layers"""
-        while not self.stop_media_sync:
-            time.sleep(self.sync_settings['throttle_interval'])
-            
-            # Send sync for all tracked layers
+        """Scheduler job: send sync packets for all tracked layers"""
+        try:
             if self.current_nowde_device and self.layers:
-                for layer_name, layer_data in self.layers.items():
-                    self.media_sync.update_layer(
-                        layer_name=layer_name,
-                        filename=layer_data["filename"],
-                        position=layer_data["position"],
-                        duration=layer_data["duration"],
-                        state=layer_data["state"]
-                    )
+                self.media_sync.update_layers(self.layers)
+        except Exception as e:
+            print(f"Error in media sync: {e}")
     
-    def start_running_state_thread(self):
-        """Start background thread to query running state periodically"""
-        self.stop_running_state = False
-        
-        def running_state_loop():
-            while not self.stop_running_state:
-                try:
-                    # Query running state only if sender is initialized (received HELLO)
-                    if self.current_nowde_device and self.output_manager.current_port and self.sender_initialized:
-                        self.output_manager.send_query_running_state()
-                    time.sleep(2.0)  # 0.5Hz query rate to reduce large SysEx bursts
-                except Exception as e:
-                    print(f"Error in running state thread: {e}")
-                    time.sleep(1)
-        
-        self.running_state_thread = threading.Thread(target=running_state_loop, daemon=True)
-        self.running_state_thread.start()
-        print("Running state query thread started")
+    def query_running_state(self):
+        """Scheduler job: query running state periodically"""
+        try:
+            # Query running state only if sender is initialized (received HELLO)
+            if self.current_nowde_device and self.output_manager.current_port and self.sender_initialized:
+                self.output_manager.send_query_running_state()
+        except Exception as e:
+            print(f"Error querying running state: {e}")
     
     def start_dali_scan_thread(self):
         """Start background thread to scan for DALI channel presence"""
-        self.stop_dali_scan = False
+        self.stop_dali_scan.clear()
         
         def dali_scan_loop():
             # Initial delay to let connection stabilize
-            time.sleep(2)
+            if self.stop_dali_scan.wait(2):
+                return
             
-            while not self.stop_dali_scan:
+            while not self.stop_dali_scan.is_set():
                 try:
                     # Scan DALI addresses 0-15 (L1-L16)
                     if self.dali_manager and self.dali_manager.is_connected:
@@ -1614,18 +2131,28 @@ class MilluBridge:
                         if detected:
                             print(f"[DALI] Scan complete: detected L{', L'.join(map(str, detected))}")
                         
-                        # Update UI once after all scanning is done
-                        self.update_lights_table()
+                        # Update UI once after all scanning is done (next GUI frame)
+                        self.lights_table_dirty = True
                     
-                    # Scan every 30 seconds (conservative to avoid congestion)
-                    time.sleep(30)
                 except Exception as e:
                     print(f"Error in DALI scan thread: {e}")
-                    time.sleep(30)
+                
+                # Sleep until the next scan, a DALI connection or quit
+                self.dali_scan_wakeup.wait(DALI_SCAN_INTERVAL)
+                self.dali_scan_wakeup.clear()
         
         self.dali_scan_thread = threading.Thread(target=dali_scan_loop, daemon=True)
         self.dali_scan_thread.start()
     
+    def stop_dali_scan_thread(self):
+        """Stop the DALI scan thread, waking it from its wait"""
+        self.stop_dali_scan.set()
+        self.dali_scan_wakeup.set()
+    
+    def _on_identify_clicked(self, sender, app_data, user_data):
+        """Light channel button callback (user_data is the channel)"""
+        self.identify_channel(user_data)
+    
     def identify_channel(self, channel: int):
         """Run identify pattern (OFF/ON/OFF/ON/OFF) on a DALI channel"""
         if not self.dali_manager or not self.dali_manager.is_connected:
@@ -1658,38 +2185,41 @@ class MilluBridge:
         self.update_osc_log(f"DALI: Identifying L{channel}")
     
     def auto_refresh_midi_devices(self):
-        """Background thread to periodically check for Nowde devices"""
-        last_ports = set()
+        """Scheduler job: periodically check for Nowde devices
         
-        while not self.stop_midi_refresh:
-            time.sleep(2)  # Check every 2 seconds
+        Only the port lists are polled here. A change hands the refresh (port
+        open/close, combo updates) to the GUI thread, so media sync ticks never
+        wait on a (re)connection.
+        """
+        try:
+            # Compare the raw port lists: on the idle path nothing else is built
+            current_ports = (tuple(self.output_manager.get_ports()), tuple(self.input_manager.get_ports()))
             
-            try:
-                # Get all available ports (union of input and output)
-                out_ports = set(self.output_manager.get_ports())
-                in_ports = set(self.input_manager.get_ports())
-                current_ports = out_ports | in_ports
-                
-                # Only update if ports changed
-                if current_ports != last_ports:
-                    self.refresh_midi_devices()
-                    last_ports = current_ports
-            except Exception as e:
-                # Handle errors during port enumeration (e.g., device unplugged mid-query)
-                print(f"Warning: Error in MIDI device refresh: {e}")
-                time.sleep(0.5)  # Short delay before retry
+            # Only update if ports changed
+            if current_ports != self.last_midi_ports:
+                self.last_midi_ports = current_ports
+                self.ui_call(self.refresh_midi_devices)
+        except Exception as e:
+            # Handle errors during port enumeration (e.g., device unplugged mid-query)
+            # The next poll retries
+            print(f"Warning: Error in MIDI device refresh: {e}")
 
     def update_osc_status(self, active):
-        """Update the OSC status indicator"""
-        if dpg.does_item_exist("status_indicator"):
+        """Update the OSC status indicator (no-op when the shown state is unchanged)"""
+        status = (active, self.is_running, self.osc_port)
+        if status == self.last_osc_status:
+            return
+        self.last_osc_status = status
+        
+        if self.status_indicator_id is not None:
             if active:
-                dpg.set_value("status_indicator", "[OK]")
-                dpg.configure_item("status_indicator", color=(0, 255, 0))
+                dpg.set_value(self.status_indicator_id, "[OK]")
+                dpg.configure_item(self.status_indicator_id, color=(0, 255, 0))
             else:
-                dpg.set_value("status_indicator", "[X]")
-                dpg.configure_item("status_indicator", color=(255, 0, 0))
+                dpg.set_value(self.status_indicator_id, "[X]")
+                dpg.configure_item(self.status_indicator_id, color=(255, 0, 0))
         
-        if dpg.does_item_exist("status_text"):
+        if self.status_text_id is not None:
             if active:
                 text = f"Receiving on port {self.osc_port}"
                 # color = (0, 255, 0)
@@ -1701,11 +2231,11 @@ class MilluBridge:
                 else:
                     text = "Stopped"
                     color = (150, 150, 150)
-            dpg.set_value("status_text", text)
-            dpg.configure_item("status_text", color=color)
+            dpg.set_value(self.status_text_id, text)
+            dpg.configure_item(self.status_text_id, color=color)
         
         # Show/hide OSC setup note
-        if dpg.does_item_exist("osc_setup_note"):
+        if "osc_setup_note" in self.gui_tags:
             if active:
                 # Hide note when receiving OSC
                 dpg.hide_item("osc_setup_note")
@@ -1719,18 +2249,19 @@ class MilluBridge:
         interval = 1.0 / hz
         self.sync_settings['throttle_interval'] = interval
         self.media_sync.set_throttle_interval(interval)
+        self.sim_clock_period_changed = True
         self.update_osc_log(f"Throttle updated: {hz}Hz ({interval*1000:.1f}ms interval)")
     
     def on_sync_setting_changed(self, sender, app_data):
         """Callback when sync settings are changed"""
         # Update settings from GUI
-        if dpg.does_item_exist("mtc_framerate_input"):
+        if "mtc_framerate_input" in self.gui_tags:
             self.sync_settings['mtc_framerate'] = max(1, dpg.get_value("mtc_framerate_input"))
-        if dpg.does_item_exist("freewheel_timeout_input"):
+        if "freewheel_timeout_input" in self.gui_tags:
             self.sync_settings['freewheel_timeout'] = max(0.1, dpg.get_value("freewheel_timeout_input"))
-        if dpg.does_item_exist("desync_threshold_input"):
+        if "desync_threshold_input" in self.gui_tags:
             self.sync_settings['clock_desync_threshold'] = max(10, dpg.get_value("desync_threshold_input"))
-        if dpg.does_item_exist("frame_correction_input"):
+        if "frame_correction_input" in self.gui_tags:
             self.sync_settings['frame_correction_frames'] = dpg.get_value("frame_correction_input")
         
         # Send updated settings to Nowde via SysEx (if connected)
@@ -1755,20 +2286,23 @@ class MilluBridge:
         # Send to Nowde if connected
         if self.current_nowde_device:
             rf_sim_max_delay = self.config['sender_config']['rf_simulation_max_delay_ms']
-            result = self.output_manager.send_push_full_config(rf_sim_enabled, rf_sim_max_delay)
-            if result and result[0]:
-                success, formatted_msg = result
-                self.log_nowde_message(f"TX: {formatted_msg}")
-                self.update_osc_log(f"RF Simulation: {'ENABLED' if rf_sim_enabled else 'DISABLED'}")
-            else:
-                self.update_osc_log("Error: Failed to send RF simulation config")
-                # Revert checkbox on failure
-                dpg.set_value("rf_sim_checkbox", not rf_sim_enabled)
+            
+            def on_result(result):
+                if result and result[0]:
+                    success, formatted_msg = result
+                    self.log_nowde_message(f"TX: {formatted_msg}")
+                    self.update_osc_log(f"RF Simulation: {'ENABLED' if rf_sim_enabled else 'DISABLED'}")
+                else:
+                    self.update_osc_log("Error: Failed to send RF simulation config")
+                    # Revert checkbox on failure
+                    self.ui_set("rf_sim_checkbox", not rf_sim_enabled)
+            
+            self.post_midi_tx(self.output_manager.send_push_full_config, (rf_sim_enabled, rf_sim_max_delay), on_result)
         else:
             self.update_osc_log("Warning: No Nowde connected, RF simulation setting saved for next connection")
         
-        # Save config to file
-        self.save_config()
+        # Save config to file (coalesced)
+        self.schedule_config_save()
     
     def on_rf_sim_max_delay_changed(self, sender, app_data):
         """Callback when RF simulation max delay slider changes"""
@@ -1780,35 +2314,38 @@ class MilluBridge:
         # Send to Nowde if connected and RF sim is enabled
         if self.current_nowde_device:
             rf_sim_enabled = self.config['sender_config']['rf_simulation_enabled']
-            result = self.output_manager.send_push_full_config(rf_sim_enabled, rf_sim_max_delay)
-            if result and result[0]:
-                success, formatted_msg = result
-                self.log_nowde_message(f"TX: {formatted_msg}")
-                self.update_osc_log(f"RF Simulation Max Delay: {rf_sim_max_delay}ms")
-            else:
-                self.update_osc_log("Error: Failed to send RF simulation config")
+            
+            def on_result(result):
+                if result and result[0]:
+                    success, formatted_msg = result
+                    self.log_nowde_message(f"TX: {formatted_msg}")
+                    self.update_osc_log(f"RF Simulation Max Delay: {rf_sim_max_delay}ms")
+                else:
+                    self.update_osc_log("Error: Failed to send RF simulation config")
+            
+            self.post_midi_tx(self.output_manager.send_push_full_config, (rf_sim_enabled, rf_sim_max_delay), on_result)
         else:
             self.update_osc_log("Warning: No Nowde connected, RF simulation setting saved for next connection")
         
-        # Save config to file
-        self.save_config()
+        # Save config to file (coalesced)
+        self.schedule_config_save()
     
     def upgrade_nowde_firmware(self):
         """Upgrade Nowde firmware from GitHub"""
         if not self.current_nowde_device:
             self.update_osc_log("ERROR: No Nowde connected")
-            if dpg.does_item_exist("firmware_upload_status"):
-                dpg.set_value("firmware_upload_status", "No Nowde connected")
-                dpg.configure_item("firmware_upload_status", color=(255, 0, 0))
+            if self.fw_status_id is not None:
+                dpg.set_value(self.fw_status_id, "No Nowde connected")
+                dpg.configure_item(self.fw_status_id, color=(255, 0, 0))
             return
         
         # Update status
-        if dpg.does_item_exist("firmware_upload_status"):
-            dpg.set_value("firmware_upload_status", "Fetching firmware from GitHub...")
-            dpg.configure_item("firmware_upload_status", color=(255, 255, 0))
-        if dpg.does_item_exist("firmware_upload_progress"):
-            dpg.configure_item("firmware_upload_progress", show=True)
-            dpg.set_value("firmware_upload_progress", 0.0)
+        if self.fw_status_id is not None:
+            dpg.set_value(self.fw_status_id, "Fetching firmware from GitHub...")
+            dpg.configure_item(self.fw_status_id, color=(255, 255, 0))
+        if self.fw_progress_id is not None:
+            dpg.configure_item(self.fw_progress_id, show=True)
+            dpg.set_value(self.fw_progress_id, 0.0)
         
         self.update_osc_log("Starting firmware upgrade...")
         
@@ -1816,31 +2353,57 @@ class MilluBridge:
         thread = threading.Thread(target=self._upgrade_firmware_thread, daemon=True)
         thread.start()
     
+    def _wait_for_nowde_port(self, present, timeout):
+        """Poll MIDI output ports until a Nowde port is present (or gone); False on timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                found = any(port.startswith("Nowde") for port in self.output_manager.get_ports())
+            except Exception:
+                found = False
+            if found == present:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(FIRMWARE_PORT_POLL_INTERVAL)
+    
     def _upgrade_firmware_thread(self):
         """Background thread for firmware upgrade via OTA"""
-        firmware_file = None
+        # Deferred import: requests is only needed for firmware downloads
+        import requests
+        
         try:
             # Step 1: Download firmware from GitHub
             self.update_osc_log("Downloading firmware from GitHub...")
             firmware_url = "https://github.com/Hemisphere-Project/MillluBridge/raw/refs/heads/main/Nowde/bin/firmware.bin"
             
-            if dpg.does_item_exist("firmware_upload_status"):
-                dpg.set_value("firmware_upload_status", "Downloading...")
-            
-            # Download with timeout
-            response = requests.get(firmware_url, timeout=30)
-            response.raise_for_status()
+            if self.fw_status_id is not None:
+                self.ui_set(self.fw_status_id, "Downloading...")
+            
+            # Streamed download with timeout: progress moves during the download (0% to 10%)
+            firmware_data = bytearray()
+            with requests.get(firmware_url, stream=True, timeout=(5, 30)) as response:
+                response.raise_for_status()
+                # Content-Length counts bytes on the wire (compressed with Content-Encoding),
+                # so progress follows the bytes read from the socket, not the decoded size
+                wire_size = int(response.headers.get('Content-Length', 0))
+                for block in response.iter_content(chunk_size=65536):
+                    firmware_data += block
+                    if wire_size and self.fw_progress_id is not None:
+                        self.ui_set(self.fw_progress_id, 0.1 * min(1.0, response.raw.tell() / wire_size))
             
-            firmware_data = response.content
             firmware_size = len(firmware_data)
+            image_error = check_firmware_image(firmware_data)
+            if image_error:
+                raise Exception(f"Invalid firmware download: {image_error} ({firmware_size} bytes)")
             self.update_osc_log(f"✅ Downloaded firmware ({firmware_size} bytes)")
             
-            if dpg.does_item_exist("firmware_upload_progress"):
-                dpg.set_value("firmware_upload_progress", 0.1)
+            if self.fw_progress_id is not None:
+                self.ui_set(self.fw_progress_id, 0.1)
             
             # Step 2: Send OTA_BEGIN
-            if dpg.does_item_exist("firmware_upload_status"):
-                dpg.set_value("firmware_upload_status", "Starting OTA update...")
+            if self.fw_status_id is not None:
+                self.ui_set(self.fw_status_id, "Starting OTA update...")
             
             self.update_osc_log("Starting OTA update...")
             result = self.output_manager.send_ota_begin(firmware_size)
@@ -1850,12 +2413,12 @@ class MilluBridge:
             
             time.sleep(0.2)  # Give device time to prepare
             
-            if dpg.does_item_exist("firmware_upload_progress"):
-                dpg.set_value("firmware_upload_progress", 0.15)
+            if self.fw_progress_id is not None:
+                self.ui_set(self.fw_progress_id, 0.15)
             
             # Step 3: Send firmware data in chunks
-            if dpg.does_item_exist("firmware_upload_status"):
-                dpg.set_value("firmware_upload_status", "Uploading firmware...")
+            if self.fw_status_id is not None:
+                self.ui_set(self.fw_status_id, "Uploading firmware...")
             
             self.update_osc_log("Uploading firmware data...")
             
@@ -1869,6 +2432,10 @@ class MilluBridge:
             # ESP32 needs time to decode, write to flash, and process
             chunk_delay = 0.025  # 25ms per chunk
             
+            # Progress bar redraws are capped at 10Hz, log lines at one per 10% step
+            last_progress_update = 0.0
+            last_logged_percent = 0
+            
             for i in range(0, firmware_size, chunk_size):
                 chunk = firmware_data[i:i+chunk_size]
                 result = self.output_manager.send_ota_data(chunk)
@@ -1878,14 +2445,17 @@ class MilluBridge:
                 
                 sent_bytes += len(chunk)
                 chunk_count += 1
-                progress = 0.15 + (sent_bytes / firmware_size) * 0.75  # 15% to 90%
                 
-                if dpg.does_item_exist("firmware_upload_progress"):
-                    dpg.set_value("firmware_upload_progress", progress)
+                now = time.monotonic()
+                if now - last_progress_update >= 0.1 and self.fw_progress_id is not None:
+                    last_progress_update = now
+                    progress = 0.15 + (sent_bytes / firmware_size) * 0.75  # 15% to 90%
+                    self.ui_set(self.fw_progress_id, progress)
                 
                 # Log progress every 10%
                 percent = (sent_bytes * 100) // firmware_size
-                if percent % 10 == 0 and sent_bytes > 0:
+                if percent // 10 > last_logged_percent // 10:
+                    last_logged_percent = percent
                     self.update_osc_log(f"  Progress: {percent}% ({sent_bytes}/{firmware_size} bytes, {chunk_delay*1000:.0f}ms/chunk)")
                 
                 # Every 100 chunks, give device extra time for flash writes
@@ -1901,12 +2471,12 @@ class MilluBridge:
             self.update_osc_log("Waiting for device to finish writing to flash...")
             time.sleep(2)
             
-            if dpg.does_item_exist("firmware_upload_progress"):
-                dpg.set_value("firmware_upload_progress", 0.9)
+            if self.fw_progress_id is not None:
+                self.ui_set(self.fw_progress_id, 0.9)
             
             # Step 4: Send OTA_END
-            if dpg.does_item_exist("firmware_upload_status"):
-                dpg.set_value("firmware_upload_status", "Finalizing update...")
+            if self.fw_status_id is not None:
+                self.ui_set(self.fw_status_id, "Finalizing update...")
             
             self.update_osc_log("Finalizing firmware update...")
             result = self.output_manager.send_ota_end()
@@ -1914,22 +2484,22 @@ class MilluBridge:
             if not result or not result[0]:
                 raise Exception("Failed to send OTA_END")
             
-            if dpg.does_item_exist("firmware_upload_progress"):
-                dpg.set_value("firmware_upload_progress", 0.95)
+            if self.fw_progress_id is not None:
+                self.ui_set(self.fw_progress_id, 0.95)
             
             # Step 5: Device will reboot automatically
-            if dpg.does_item_exist("firmware_upload_status"):
-                dpg.set_value("firmware_upload_status", "✅ Update complete! Device rebooting...")
-                dpg.configure_item("firmware_upload_status", color=(0, 255, 0))
+            if self.fw_status_id is not None:
+                self.ui_set(self.fw_status_id, "✅ Update complete! Device rebooting...")
+                self.ui_configure(self.fw_status_id, color=(0, 255, 0))
             
             self.update_osc_log("✅ Firmware update successful! Device rebooting...")
             
             # Fully disconnect and close all MIDI connections before reboot
             self.update_osc_log("Closing MIDI connections...")
             
-            # Disconnect device (clears state and closes ports)
+            # Disconnect device (clears state and widgets on the GUI thread, ports closed below)
             if self.current_nowde_device:
-                self.disconnect_nowde_device()
+                self.ui_call(self.disconnect_nowde_device)
             
             # Ensure all MIDI ports are fully closed
             self.output_manager.close_port()
@@ -1938,51 +2508,56 @@ class MilluBridge:
             # Wait longer for device to fully reboot and re-enumerate USB
             # ESP32 needs time to: validate firmware, switch partitions, reboot, and reconnect
             self.update_osc_log("Waiting for device to reboot and re-enumerate USB...")
-            time.sleep(8)  # 8 seconds for full reboot cycle
+            # The port may vanish too briefly to be seen: not finding the gap is fine
+            self._wait_for_nowde_port(False, 5.0)
+            if self._wait_for_nowde_port(True, FIRMWARE_REBOOT_TIMEOUT):
+                self.update_osc_log("Device re-enumerated")
+            else:
+                self.update_osc_log(f"Warning: Nowde MIDI port not back after {FIRMWARE_REBOOT_TIMEOUT:.0f}s")
             
-            if dpg.does_item_exist("firmware_upload_progress"):
-                dpg.set_value("firmware_upload_progress", 1.0)
+            if self.fw_progress_id is not None:
+                self.ui_set(self.fw_progress_id, 1.0)
             
             # Refresh MIDI devices to detect reconnected device
             # This will auto-connect and start listening for HELLO message
             self.update_osc_log("Scanning for reconnected device...")
-            self.refresh_midi_devices()
+            self.ui_call(self.refresh_midi_devices)
             
             # HELLO message will arrive asynchronously and update version display
             self.update_osc_log("✅ Firmware update complete - waiting for device HELLO...")
             
             # Hide progress bar and status after a delay
             time.sleep(2)
-            if dpg.does_item_exist("firmware_upload_progress"):
-                dpg.configure_item("firmware_upload_progress", show=False)
-            if dpg.does_item_exist("firmware_upload_status"):
-                dpg.set_value("firmware_upload_status", "")
+            if self.fw_progress_id is not None:
+                self.ui_configure(self.fw_progress_id, show=False)
+            if self.fw_status_id is not None:
+                self.ui_set(self.fw_status_id, "")
             
         except requests.exceptions.RequestException as e:
             error_msg = f"Download failed: {str(e)}"
             self.update_osc_log(f"❌ {error_msg}")
             
-            if dpg.does_item_exist("firmware_upload_status"):
-                dpg.set_value("firmware_upload_status", "Download failed - check network")
-                dpg.configure_item("firmware_upload_status", color=(255, 0, 0))
+            if self.fw_status_id is not None:
+                self.ui_set(self.fw_status_id, "Download failed - check network")
+                self.ui_configure(self.fw_status_id, color=(255, 0, 0))
             
-            if dpg.does_item_exist("firmware_upload_progress"):
-                dpg.configure_item("firmware_upload_progress", show=False)
+            if self.fw_progress_id is not None:
+                self.ui_configure(self.fw_progress_id, show=False)
             
         except Exception as e:
             error_msg = f"OTA update failed: {str(e)}"
             self.update_osc_log(f"❌ {error_msg}")
             
-            if dpg.does_item_exist("firmware_upload_status"):
-                dpg.set_value("firmware_upload_status", str(e))
-                dpg.configure_item("firmware_upload_status", color=(255, 0, 0))
+            if self.fw_status_id is not None:
+                self.ui_set(self.fw_status_id, str(e))
+                self.ui_configure(self.fw_status_id, color=(255, 0, 0))
             
-            if dpg.does_item_exist("firmware_upload_progress"):
-                dpg.configure_item("firmware_upload_progress", show=False)
+            if self.fw_progress_id is not None:
+                self.ui_configure(self.fw_progress_id, show=False)
             
             # Try to reconnect to MIDI anyway
             time.sleep(1)
-            self.refresh_midi_devices()
+            self.ui_call(self.refresh_midi_devices)
     
     def on_osc_settings_changed(self, sender, app_data):
         """Callback when OSC settings are changed"""
@@ -1997,7 +2572,7 @@ class MilluBridge:
             self.osc_port = new_port
             self.update_osc_log(f"OSC port changed to {self.osc_port}")
             # Save config
-            self.save_config()
+            self.schedule_config_save()
             # Restart the bridge with new settings
             self.restart_bridge()
     
@@ -2019,17 +2594,15 @@ class MilluBridge:
         # Start OSC server
         self.is_running = True
         self.osc_server.start()
-        self.last_osc_time = time.time()
+        self.last_osc_time = time.monotonic()
+        self.osc_status_active = False
+        self.update_osc_status(False)
         self.update_osc_log(f"Bridge started on port {self.osc_port} (listening on all interfaces)")
-        
-        # Start status check thread
-        if self.status_check_thread is None or not self.status_check_thread.is_alive():
-            self.status_check_thread = threading.Thread(target=self.check_osc_status, daemon=True)
-            self.status_check_thread.start()
     
     def stop_bridge(self):
         """Stop the OSC-MIDI bridge"""
         self.is_running = False
+        self.osc_status_active = False
         if self.osc_server:
             self.osc_server.stop()
         self.disconnect_nowde_device()
@@ -2049,6 +2622,8 @@ class MilluBridge:
     def on_simulation_mode_changed(self, mac, mode):
         """Callback when simulation mode is changed for a Remote Nowde"""
         self.simulation_settings['mac'][mac] = mode
+        self.refresh_simulated_layers()
+        self.layers_table_dirty = True  # Simulated layers are hidden from the layers table
         self.update_osc_log(f"Simulation for {self.remote_nowdes.get(mac, {}).get('uuid', mac)}: {mode}")
         
         # Auto-start/stop simulation clock based on whether any remote needs it
@@ -2057,12 +2632,7 @@ class MilluBridge:
     def _auto_manage_simulation_clock(self):
         """Automatically start/stop simulation clock based on remote Nowde simulation states"""
         # Check if any remote Nowde has simulation enabled (not "Disabled")
-        any_simulation_active = False
-        for mac in self.remote_nowdes.keys():
-            sim_mode = self.simulation_settings['mac'].get(mac, 'Disabled')
-            if sim_mode != 'Disabled':
-                any_simulation_active = True
-                break
+        any_simulation_active = bool(self.simulating_macs)
         
         # Start clock if needed and not running
         if any_simulation_active and not self.simulation_clock_running:
@@ -2083,19 +2653,20 @@ class MilluBridge:
             # Stop clock
             self.stop_simulation_clock = True
             self.simulation_clock_running = False
-            if dpg.does_item_exist("sim_clock_btn"):
+            if "sim_clock_btn" in self.gui_tags:
                 dpg.set_value("sim_clock_btn", "Start Clock")
-            if dpg.does_item_exist("sim_clock_status"):
+            if "sim_clock_status" in self.gui_tags:
                 dpg.set_value("sim_clock_status", "Stopped")
                 dpg.configure_item("sim_clock_status", color=(150, 150, 150))
         else:
             # Start clock
             self.simulation_clock_position = 0.0
+            self.simulation_clock_started_at = time.monotonic()
             self.stop_simulation_clock = False
             self.simulation_clock_running = True
-            if dpg.does_item_exist("sim_clock_btn"):
+            if "sim_clock_btn" in self.gui_tags:
                 dpg.set_value("sim_clock_btn", "Stop Clock")
-            if dpg.does_item_exist("sim_clock_status"):
+            if "sim_clock_status" in self.gui_tags:
                 dpg.set_value("sim_clock_status", "Running")
                 dpg.configure_item("sim_clock_status", color=(0, 255, 0))
             
@@ -2105,80 +2676,91 @@ class MilluBridge:
                 self.simulation_clock_thread.start()
     
     def simulation_clock_loop(self):
-        """Background thread for simulation clock"""
-        import time
-        
-        last_time = time.time()
+        """Background thread for simulation clock
+        
+        Position is derived from the monotonic start time (no accumulated deltas, immune
+        to wall clock steps) and ticks follow absolute deadlines, so slow iterations
+        don't add drift.
+        """
+        monotonic = time.monotonic  # Local bindings: no module attribute lookups per tick
+        sleep = time.sleep
+        period = self.sync_settings['throttle_interval']
+        next_tick = monotonic()
+        next_text_update = next_tick
         
         while self.simulation_clock_running and not self.stop_simulation_clock:
-            current_time = time.time()
-            delta = current_time - last_time
-            last_time = current_time
-            
-            # Update clock position
-            self.simulation_clock_position += delta
-            
-            # Loop back to 0 when reaching duration
-            if self.simulation_clock_position >= self.simulation_clock_duration:
-                self.simulation_clock_position = 0.0
-            
-            # Update GUI
-            if dpg.does_item_exist("sim_clock_position_text"):
-                dpg.set_value("sim_clock_position_text", 
+            # Update clock position, looping back to 0 when reaching duration
+            elapsed = monotonic() - self.simulation_clock_started_at
+            duration = self.simulation_clock_duration
+            self.simulation_clock_position = elapsed % duration if duration > 0 else 0.0
+            
+            # Update GUI (label at 10Hz at most, whatever the tick rate)
+            if self.sim_clock_position_id is not None and next_tick >= next_text_update:
+                next_text_update = next_tick + SIM_CLOCK_TEXT_INTERVAL
+                self.ui_set(self.sim_clock_position_id, 
                             f"{self.simulation_clock_position:.1f}s / {self.simulation_clock_duration:.1f}s")
             
             # Send sync messages to all Remote Nowdes in simulation mode
-            if self.current_nowde_device and self.output_manager.current_port:
+            simulating_macs = self.simulating_macs
+            if simulating_macs and self.current_nowde_device and self.output_manager.current_port:
                 position_ms = int(self.simulation_clock_position * 1000)
                 
-                for mac, nowde in self.remote_nowdes.items():
+                # One frame per layer per tick: remotes sharing a layer receive the same frame
+                # (the last simulating remote of a layer wins, as receivers saw before)
+                layer_frames = {}
+                sim_modes = self.simulation_settings['mac']
+                for mac in simulating_macs:
+                    nowde = self.remote_nowdes.get(mac)
                     # Skip disconnected/missing devices
-                    if nowde.get('last_seen_ms', 99999) > 10000:
+                    if nowde is None or nowde.get('last_seen_ms', 99999) > 10000:
                         continue
                     
-                    sim_mode = self.simulation_settings['mac'].get(mac, 'Disabled')
-                    
-                    if sim_mode == 'Disabled':
+                    # Media index and state for this mode (None for 'Disabled' or unknown modes)
+                    frame = SIM_MODE_FRAMES.get(sim_modes.get(mac))
+                    if frame is None:
                         continue
                     
                     layer_name = nowde.get('layer', '')
                     if not layer_name:
                         continue
                     
-                    # Determine media index and state
-                    if sim_mode == 'Stop':
-                        media_index = 0
-                        state = 'stopped'
-                    else:
-                        # sim_mode is '1' through '10'
-                        try:
-                            media_index = int(sim_mode)
-                            state = 'playing'
-                        except ValueError:
-                            continue
-                    
-                    # Send media sync (simulation takes priority over real OSC for this layer)
-                    self.output_manager.send_media_sync(
-                        layer_name=layer_name,
-                        media_index=media_index,
-                        position_ms=position_ms,
-                        state=state
-                    )
-            
-            # Sleep for throttle interval
-            time.sleep(self.sync_settings['throttle_interval'])
+                    layer_frames[layer_name] = frame
+                
+                # Send media sync (simulation takes priority over real OSC for this layer)
+                buffers = self.simulation_sync_buffers
+                batch = []
+                for layer_name, (media_index, state) in layer_frames.items():
+                    buf = buffers.get(layer_name)
+                    if buf is None:
+                        buf = buffers[layer_name] = self.output_manager.new_media_sync_buffer(layer_name)
+                    batch.append((buf, media_index, position_ms, state))
+                if batch:
+                    self.output_manager.send_media_sync_batch(batch)
+            
+            # Sleep until the next deadline; if we fell behind, restart the schedule from now
+            if self.sim_clock_period_changed:
+                # Clear before reading so a change racing with this read is seen next tick
+                self.sim_clock_period_changed = False
+                period = self.sync_settings['throttle_interval']
+            next_tick += period
+            delay = next_tick - monotonic()
+            if delay > 0:
+                sleep(delay)
+            else:
+                next_tick = monotonic()
     
     def on_dali_status_changed(self, connected: bool, device_path: str):
         """Callback when DALI connection status changes"""
         self.update_dali_status(connected, device_path)
         if connected:
             self.update_osc_log(f"DALI Master connected: {device_path if device_path else 'Unknown'}")
+            self.dali_scan_wakeup.set()  # Scan channels now rather than at the next interval
         else:
             self.update_osc_log("DALI Master disconnected")
     
     def update_dali_status(self, connected: bool, device_path: str = ''):
         """Update the DALI status indicator in GUI"""
-        if dpg.does_item_exist("dali_status_indicator"):
+        if "dali_status_indicator" in self.gui_tags:
             if connected:
                 dpg.set_value("dali_status_indicator", "[OK]")
                 dpg.configure_item("dali_status_indicator", color=(0, 255, 0))
@@ -2186,7 +2768,7 @@ class MilluBridge:
                 dpg.set_value("dali_status_indicator", "[X]")
                 dpg.configure_item("dali_status_indicator", color=(255, 0, 0))
         
-        if dpg.does_item_exist("dali_status_text"):
+        if "dali_status_text" in self.gui_tags:
             if connected:
                 if device_path:
                     # Show just the device name, not full path
@@ -2211,7 +2793,7 @@ class MilluBridge:
             
             self.dali_manager.broadcast_on()
             self.update_osc_log("DALI: All On (broadcast)")
-            self.update_lights_table()
+            self.lights_table_dirty = True
         else:
             self.update_osc_log("DALI: Device not connected")
     
@@ -2225,16 +2807,17 @@ class MilluBridge:
             
             self.dali_manager.broadcast_off()
             self.update_osc_log("DALI: Blackout (broadcast)")
-            self.update_lights_table()
+            self.lights_table_dirty = True
         else:
             self.update_osc_log("DALI: Device not connected")
     
     def on_quit(self):
         """Callback for Quit button"""
-        self.stop_midi_refresh = True
-        self.stop_media_sync = True
+        self.stop_scheduler_thread()
+        self.input_manager.stop_listener_thread()
+        self.flush_config_save()
         self.stop_simulation_clock = True
-        self.stop_dali_scan = True
+        self.stop_dali_scan_thread()
         self.simulation_clock_running = False
         if self.dali_manager:
             self.dali_manager.stop_monitoring_thread()
@@ -2242,17 +2825,10 @@ class MilluBridge:
             self.stop_bridge()
         dpg.stop_dearpygui()
     
-    def check_osc_status(self):
-        """Background thread to check OSC status"""
-        while self.is_running:
-            if time.time() - self.last_osc_time > 2:
-                self.update_osc_status(False)
-            time.sleep(0.5)
-
     def run(self):
         """Run the DearPyGUI application"""
         # Setup DearPyGUI
-        dpg.create_viewport(title="MilluBridge - OSC to MIDI Bridge", width=920, height=750)
+        dpg.create_viewport(title="MilluBridge - OSC to MIDI Bridge", width=920, height=750, vsync=True)
         dpg.setup_dearpygui()
         
         # Set primary window
@@ -2261,22 +2837,41 @@ class MilluBridge:
         # Show viewport
         dpg.show_viewport()
         
-        # Main loop
+        # Main loop: vsync paces the frames, the sleep caps them when it is not honoured.
+        # A vsync-blocked render returns near the end of the frame interval, so only a
+        # frame that finished in under half of it sleeps (a short sleep that overshoots
+        # the next vblank would halve the UI rate).
+        # The frame start reading also serves the OSC status check and the log flush interval
+        monotonic = time.monotonic
+        sleep = time.sleep
         while dpg.is_dearpygui_running():
+            frame_start = monotonic()
+            self.drain_ui_queue()
+            self.check_osc_status(frame_start)
+            self.refresh_tables()
+            self.flush_logs(frame_start)
             dpg.render_dearpygui_frame()
+            idle = UI_FRAME_INTERVAL - (monotonic() - frame_start)
+            if idle > UI_FRAME_INTERVAL / 2:
+                sleep(idle)
         
         # Cleanup
-        self.stop_midi_refresh = True
-        self.stop_media_sync = True
-        self.stop_running_state = True
+        self.stop_scheduler_thread()
+        self.input_manager.stop_listener_thread()
+        self.flush_config_save()
         self.stop_simulation_clock = True
-        self.stop_dali_scan = True
+        self.stop_dali_scan_thread()
         self.simulation_clock_running = False
         if self.dali_manager:
             self.dali_manager.stop_monitoring_thread()
         if self.is_running:
             self.stop_bridge()
         
+        # Let woken threads finish their current MIDI/DALI I/O (bounded: they are daemons)
+        for thread in (self.scheduler_thread, self.dali_scan_thread, self.input_manager.listener_thread):
+            if thread is not None:
+                thread.join(timeout=1.0)
+        
         dpg.destroy_context()
 
 if __name__ == '__main__':
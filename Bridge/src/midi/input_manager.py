@@ -14,8 +14,45 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import rtmidi
+import queue
+import struct
 import threading
+import time
+from operator import or_
+
+import rtmidi
+
+
+PORTS_CACHE_TTL = 0.5  # seconds a port enumeration is reused (one OS walk per refresh pass)
+
+
+# High bits restored by each 7-bit MSB byte: MSB_HIGH_BITS[msb][i] is 0x80 when bit i is set
+MSB_HIGH_BITS = tuple(tuple(0x80 if msb & (1 << i) else 0 for i in range(7)) for msb in range(128))
+
+# Decoded RUNNING_STATE receiver block: MAC, layer, version, last seen ms, active, media index (36 bytes)
+RECEIVER_STRUCT = struct.Struct('>6s16s8sIBB')
+
+# ESP32 reset reason names
+RESET_REASONS = {
+    1: "POWERON",
+    3: "SOFTWARE",
+    4: "WATCHDOG",
+    5: "DEEP_SLEEP",
+    6: "BROWNOUT",
+    7: "SDIO",
+    12: "CPU0_RESET",
+    13: "CPU1_RESET"
+}
+
+# Error code names
+ERROR_NAMES = {
+    0x01: "CONFIG_INVALID",
+    0x02: "SYSEX_PARSE_ERROR",
+    0x03: "ESPNOW_SEND_FAILED",
+    0x04: "MESH_CLOCK_LOST_SYNC",
+    0x05: "RECEIVER_TIMEOUT",
+    0xFF: "UNKNOWN_ERROR"
+}
 
 
 class InputManager:
@@ -33,15 +70,19 @@ class InputManager:
             print("Warning: Could not set MIDI buffer size")
         
         self.current_port = None
+        self.ports_cache = None  # (monotonic time, get_ports() result) of the last enumeration
         self.callback = callback
         self.sysex_callback = sysex_callback
-        self.listener_thread = None
+        self.listener_thread = None  # Parses queued messages off rtmidi's callback thread
         self.is_listening = False
+        self.rx_queue = queue.SimpleQueue()  # (message, deltatime) from the rtmidi callback
         
         # SysEx constants (matching Nowde firmware)
         self.SYSEX_START = 0xF0
         self.SYSEX_END = 0xF7
         self.SYSEX_MANUFACTURER_ID = 0x7D
+        self.SYSEX_HEADER = bytes((self.SYSEX_START, self.SYSEX_MANUFACTURER_ID))  # Nowde message prefix
+        self.SYSEX_TRAILER = bytes((self.SYSEX_END,))
         
         # Nowde → Bridge Responses (0x20-0x3F)
         self.SYSEX_CMD_HELLO = 0x20
@@ -49,91 +90,157 @@ class InputManager:
         self.SYSEX_CMD_RUNNING_STATE = 0x22
         self.SYSEX_CMD_ERROR_REPORT = 0x30
         
+        # Command -> (parser, sysex_callback event type)
+        self.sysex_handlers = {
+            self.SYSEX_CMD_HELLO: (self._parse_hello, 'hello'),
+            self.SYSEX_CMD_CONFIG_STATE: (self._parse_config_state, 'config_state'),
+            self.SYSEX_CMD_RUNNING_STATE: (self._parse_running_state, 'running_state'),
+            self.SYSEX_CMD_ERROR_REPORT: (self._parse_error_report, 'error_report'),
+        }
+        
         # SysEx parsing state
-        self.sysex_buffer = []
+        self.sysex_buffer = bytearray()
         self.in_sysex = False
     
     def _decode_7bit(self, encoded_data):
         """Decode 7-bit MIDI format back to 8-bit data
         Every 8 bytes of input becomes 7 bytes of output (MSBs unpacked from first byte)
+        Returns a bytearray (indexes as ints, decodes as ASCII without a copy to bytes)
         """
-        decoded = []
-        idx = 0
+        decoded = bytearray()
         
-        while idx < len(encoded_data):
-            # Read MSB byte
-            msb_byte = encoded_data[idx]
-            idx += 1
-            
-            # Decode up to 7 data bytes
-            chunk_size = min(7, len(encoded_data) - idx)
-            for i in range(chunk_size):
-                if idx >= len(encoded_data):
-                    break
-                byte_val = encoded_data[idx]
-                idx += 1
-                # Restore MSB if it was set
-                if msb_byte & (1 << i):
-                    byte_val |= 0x80
-                decoded.append(byte_val)
+        # One table lookup per 8-byte group, then a C-level OR over its (up to) 7 data bytes
+        for idx in range(0, len(encoded_data), 8):
+            high_bits = MSB_HIGH_BITS[encoded_data[idx] & 0x7F]
+            decoded += bytes(map(or_, encoded_data[idx + 1:idx + 8], high_bits))
         
         return decoded
 
     def get_ports(self):
-        """Get list of available MIDI input ports"""
+        """Get list of available MIDI input ports (reused for PORTS_CACHE_TTL)"""
+        cache = self.ports_cache
+        if cache is not None and time.monotonic() - cache[0] < PORTS_CACHE_TTL:
+            return cache[1]
         try:
             ports = self.midi_in.get_ports()
             if not ports:
-                return ["No MIDI ports available"]
+                ports = ["No MIDI ports available"]
+            self.ports_cache = (time.monotonic(), ports)
             return ports
         except Exception as e:
             # Port list changed during enumeration (device unplugged)
+            self.ports_cache = None
             print(f"Warning: Error enumerating MIDI input ports: {e}")
             return []
 
-    def open_port(self, port_name):
-        """Open a MIDI input port by name"""
+    def open_port(self, port_name, port_index=None):
+        """Open a MIDI input port by name
+        port_index: its index in a get_ports() list the caller just fetched (skips a re-enumeration)
+        """
         # Close existing port if open
         self.close_port()
         
-        ports = self.midi_in.get_ports()
-        if port_name in ports:
+        if port_index is None:
+            ports = self.get_ports()
+            if port_name not in ports:
+                return False
             port_index = ports.index(port_name)
-            self.midi_in.open_port(port_index)
-            self.current_port = port_name
-            
-            # Set up callback for incoming messages
-            self.midi_in.set_callback(self._on_midi_message)
-            
-            print(f"Opened MIDI input port: {port_name}")
-            return True
-        return False
-
-    def _on_midi_message(self, event, data=None):
-        """Internal callback for MIDI messages"""
-        message, deltatime = event
+        self.midi_in.open_port(port_index)
+        self.current_port = port_name
         
-        # Process SysEx messages
-        self._process_sysex(message)
+        # Set up callback for incoming messages
+        self._start_listener_thread()
+        self.midi_in.set_callback(self._on_midi_message)
         
-        # Forward to general callback
-        if self.callback:
-            self.callback(message, deltatime)
+        print(f"Opened MIDI input port: {port_name}")
+        return True
+
+    def _start_listener_thread(self):
+        """Start the parsing thread once, it outlives port changes"""
+        if self.listener_thread is not None and self.listener_thread.is_alive():
+            return
+        self.is_listening = True
+        self.listener_thread = threading.Thread(target=self._listener_loop, daemon=True)
+        self.listener_thread.start()
+
+    def stop_listener_thread(self):
+        """Stop the parsing thread: clear the flag and wake its blocking get with a sentinel"""
+        self.is_listening = False
+        self.rx_queue.put(None)
+    
+    def _on_midi_message(self, event, data=None):
+        """rtmidi callback: only queue the message, a slow parse must not stall reception"""
+        self.rx_queue.put(event)
+
+    def _listener_loop(self):
+        """Listener thread: parse queued messages in arrival order, a whole burst per wakeup"""
+        rx_get = self.rx_queue.get
+        rx_get_nowait = self.rx_queue.get_nowait
+        while self.is_listening:
+            events = [rx_get()]
+            try:
+                while True:
+                    events.append(rx_get_nowait())
+            except queue.Empty:
+                pass
+            
+            for event in events:
+                if event is None:
+                    return  # stop_listener_thread() sentinel
+                message, deltatime = event
+                try:
+                    # Process SysEx messages
+                    self._process_sysex(message)
+                    
+                    # Forward to general callback
+                    if self.callback:
+                        self.callback(message, deltatime)
+                except Exception as e:
+                    print(f"Error processing MIDI message: {e}")
     
     def _process_sysex(self, message):
         """Process incoming MIDI message for SysEx data"""
-        for byte in message:
-            if byte == self.SYSEX_START:
+        if not self.in_sysex and self.SYSEX_START not in message:
+            return  # Channel/system message, or the tail of a dropped foreign SysEx
+        
+        msg = bytes(message)
+        if not self.in_sysex:
+            last = len(msg) - 1
+            if msg[0] == self.SYSEX_START and msg.find(self.SYSEX_END) == last and \
+               msg.find(self.SYSEX_START, 1) < 0:
+                # rtmidi delivers complete SysEx messages in one callback: no buffering
+                # (exactly one F0..F7 frame; back-to-back frames go through the split below)
+                if last > 0 and msg[1] != self.SYSEX_MANUFACTURER_ID:
+                    return  # Foreign SysEx (DAW, plug-in...)
+                self._handle_sysex_message(msg)
+                return
+        
+        # Fragmented SysEx: locate F0/F7 with bytes.find/rfind and accumulate whole segments
+        while msg:
+            end = msg.find(self.SYSEX_END)
+            segment = msg if end < 0 else msg[:end + 1]
+            start = segment.rfind(self.SYSEX_START)
+            if start >= 0:
+                # A SysEx starts here (an unterminated one before it is dropped)
                 self.in_sysex = True
-                self.sysex_buffer = [byte]
+                self.sysex_buffer = bytearray(segment[start:])
             elif self.in_sysex:
-                self.sysex_buffer.append(byte)
-                
-                if byte == self.SYSEX_END:
-                    # Complete SysEx message received
-                    self._handle_sysex_message(self.sysex_buffer)
-                    self.in_sysex = False
-                    self.sysex_buffer = []
+                self.sysex_buffer += segment
+            
+            if self.in_sysex and len(self.sysex_buffer) > 1 and \
+               self.sysex_buffer[1] != self.SYSEX_MANUFACTURER_ID:
+                # Foreign SysEx: stop buffering, its remaining data bytes hold no F0 and are ignored
+                self.in_sysex = False
+                self.sysex_buffer = bytearray()
+            
+            if end < 0:
+                return
+            if self.in_sysex:
+                # Complete SysEx message received
+                self.in_sysex = False
+                self._handle_sysex_message(bytes(self.sysex_buffer))
+                self.sysex_buffer = bytearray()
+            msg = msg[end + 1:]
     
     def _handle_sysex_message(self, sysex_data):
         """Parse and handle complete SysEx message"""
@@ -142,36 +249,18 @@ class InputManager:
             return
         
         # Silently ignore non-matching manufacturer IDs (system SysEx, etc.)
-        if sysex_data[0] != self.SYSEX_START or \
-           sysex_data[-1] != self.SYSEX_END:
-            return
-        
-        if sysex_data[1] != self.SYSEX_MANUFACTURER_ID:
+        if not (sysex_data.startswith(self.SYSEX_HEADER) and sysex_data.endswith(self.SYSEX_TRAILER)):
             return
         
         command = sysex_data[2]
-        formatted_msg = None
-        
-        if command == self.SYSEX_CMD_HELLO:
-            hello_data, formatted_msg = self._parse_hello(sysex_data)
-            if self.sysex_callback and hello_data:
-                self.sysex_callback('hello', hello_data)
-        
-        elif command == self.SYSEX_CMD_CONFIG_STATE:
-            config_data, formatted_msg = self._parse_config_state(sysex_data)
-            if self.sysex_callback and config_data:
-                self.sysex_callback('config_state', config_data)
-        
-        elif command == self.SYSEX_CMD_RUNNING_STATE:
-            running_data, formatted_msg = self._parse_running_state(sysex_data)
-            if self.sysex_callback and running_data:
-                self.sysex_callback('running_state', running_data)
-        
-        elif command == self.SYSEX_CMD_ERROR_REPORT:
-            error_data, formatted_msg = self._parse_error_report(sysex_data)
-            if self.sysex_callback and error_data:
-                self.sysex_callback('error_report', error_data)
-        
+        handler = self.sysex_handlers.get(command)
+        
+        if handler:
+            parse, event_type = handler
+            # Parsers slice a memoryview: per-field/per-receiver slices share the message buffer
+            data, formatted_msg = parse(memoryview(sysex_data))
+            if self.sysex_callback and data:
+                self.sysex_callback(event_type, data)
         else:
             formatted_msg = f"SysEx: Unknown command 0x{command:02X}"
         
@@ -194,7 +283,7 @@ class InputManager:
         version_decoded = self._decode_7bit(version_encoded)
         if len(version_decoded) < 8:
             return None, "SysEx: HELLO (invalid version encoding)"
-        version_str = bytes(version_decoded[:8]).decode('ascii', errors='ignore').rstrip('\x00')
+        version_str = version_decoded[:8].split(b'\x00', 1)[0].decode('ascii', errors='ignore')
         idx += 10
         
         # Uptime (5 bytes encoded -> 4 bytes decoded)
@@ -203,25 +292,13 @@ class InputManager:
         if len(uptime_decoded) < 4:
             return None, "SysEx: HELLO (invalid uptime)"
         
-        uptime_ms = (uptime_decoded[0] << 24) | (uptime_decoded[1] << 16) | (uptime_decoded[2] << 8) | uptime_decoded[3]
+        uptime_ms = int.from_bytes(uptime_decoded[:4], 'big')
         idx += 5
         
         # Boot reason (1 byte)
         boot_reason = sysex_data[idx]
         
-        # ESP32 reset reason names
-        reset_reasons = {
-            1: "POWERON",
-            3: "SOFTWARE",
-            4: "WATCHDOG",
-            5: "DEEP_SLEEP",
-            6: "BROWNOUT",
-            7: "SDIO",
-            12: "CPU0_RESET",
-            13: "CPU1_RESET"
-        }
-        
-        boot_reason_str = reset_reasons.get(boot_reason, f"UNKNOWN_0x{boot_reason:02X}")
+        boot_reason_str = RESET_REASONS.get(boot_reason, f"UNKNOWN_0x{boot_reason:02X}")
         
         hello_data = {
             'version': version_str,
@@ -267,7 +344,7 @@ class InputManager:
         if len(uptime_decoded) < 4:
             return None, "SysEx: RUNNING_STATE (invalid uptime)"
         
-        uptime_ms = (uptime_decoded[0] << 24) | (uptime_decoded[1] << 16) | (uptime_decoded[2] << 8) | uptime_decoded[3]
+        uptime_ms = int.from_bytes(uptime_decoded[:4], 'big')
         uptime_s = uptime_ms / 1000.0
         idx += 5
         
@@ -300,43 +377,36 @@ class InputManager:
         
         receivers = []
         
+        # Loop invariants as locals (runs on the MIDI listener thread, up to 255 receivers)
+        decode = self._decode_7bit
+        data_end = len(sysex_data) - 1  # -1 for SYSEX_END
+        receivers_append = receivers.append
+        unpack_receiver = RECEIVER_STRUCT.unpack_from
+        
         # Parse each receiver (42 bytes encoded -> 36 bytes decoded)
         for _ in range(chunk_receiver_count):
-            if idx + 42 > len(sysex_data) - 1:  # -1 for SYSEX_END
+            if idx + 42 > data_end:
                 break
             
             # Decode receiver data (42 bytes encoded -> 36 bytes decoded)
-            receiver_encoded = sysex_data[idx:idx+42]
-            receiver_decoded = self._decode_7bit(receiver_encoded)
+            receiver_decoded = decode(sysex_data[idx:idx+42])
             
-            if len(receiver_decoded) < 36:
+            if len(receiver_decoded) < RECEIVER_STRUCT.size:
                 break
             
-            # MAC (6 bytes)
-            mac_bytes = receiver_decoded[0:6]
-            mac_str = ':'.join(f'{b:02X}' for b in mac_bytes)
-            
-            # Layer (16 bytes)
-            layer_bytes = receiver_decoded[6:22]
-            layer_str = bytes(layer_bytes).decode('ascii', errors='ignore').rstrip('\x00')
+            # One C-level unpack of the whole block instead of per-field slices
+            mac_bytes, layer_raw, version_raw, last_seen_ms, active, media_index = unpack_receiver(receiver_decoded)
+            mac_str = mac_bytes.hex(':').upper()
             
-            # Version (8 bytes)
-            version_bytes = receiver_decoded[22:30]
-            version_str = bytes(version_bytes).decode('ascii', errors='ignore').rstrip('\x00')
-            
-            # Last seen (4 bytes, milliseconds ago)
-            last_seen_ms = (receiver_decoded[30] << 24) | (receiver_decoded[31] << 16) | (receiver_decoded[32] << 8) | receiver_decoded[33]
-            
-            # Active (1 byte)
-            active = receiver_decoded[34] != 0
-            
-            # Media index (1 byte) - current playing media index (0 = stopped)
-            media_index = receiver_decoded[35]
+            # Layer and version are NUL padded
+            layer_str = layer_raw.split(b'\x00', 1)[0].decode('ascii', errors='ignore')
+            version_str = version_raw.split(b'\x00', 1)[0].decode('ascii', errors='ignore')
+            active = active != 0
             
             # Generate UUID from last 3 bytes of MAC
-            uuid = mac_str[-8:].replace(':', '')
+            uuid = mac_bytes[3:].hex().upper()
             
-            receivers.append({
+            receivers_append({
                 'mac': mac_str,
                 'uuid': uuid,
                 'layer': layer_str,
@@ -377,21 +447,11 @@ class InputManager:
         error_code = sysex_data[3]
         context_length = sysex_data[4]
         
-        context_bytes = []
+        context_bytes = b''
         if context_length > 0 and len(sysex_data) >= 6 + context_length:
-            context_bytes = sysex_data[5:5+context_length]
-        
-        # Error code names
-        error_names = {
-            0x01: "CONFIG_INVALID",
-            0x02: "SYSEX_PARSE_ERROR",
-            0x03: "ESPNOW_SEND_FAILED",
-            0x04: "MESH_CLOCK_LOST_SYNC",
-            0x05: "RECEIVER_TIMEOUT",
-            0xFF: "UNKNOWN_ERROR"
-        }
+            context_bytes = bytes(sysex_data[5:5+context_length])  # Outlives the message buffer
         
-        error_name = error_names.get(error_code, f"UNKNOWN_0x{error_code:02X}")
+        error_name = ERROR_NAMES.get(error_code, f"UNKNOWN_0x{error_code:02X}")
         
         error_data = {
             'error_code': error_code,
@@ -404,9 +464,9 @@ class InputManager:
         if context_bytes:
             # If looks like MAC address (6 bytes), format as MAC
             if len(context_bytes) == 6:
-                context_str = " MAC: " + ':'.join(f'{b:02X}' for b in context_bytes)
+                context_str = " MAC: " + context_bytes.hex(':').upper()
             else:
-                context_str = " Context: " + ' '.join(f'{b:02X}' for b in context_bytes)
+                context_str = " Context: " + context_bytes.hex(' ').upper()
         
         formatted = f"SysEx: ERROR_REPORT - {error_name} (0x{error_code:02X}){context_str}"
         return error_data, formatted
@@ -416,3 +476,8 @@ class InputManager:
             self.midi_in.close_port()
             self.current_port = None
             print("Closed MIDI input port")
+        self.invalidate_ports_cache()
+    
+    def invalidate_ports_cache(self):
+        """Make the next get_ports() enumerate again (port change, hotplug event)"""
+        self.ports_cache = None
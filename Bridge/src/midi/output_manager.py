@@ -14,101 +14,145 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import struct
+import time
+
 import rtmidi
 
 
+PORTS_CACHE_TTL = 0.5  # seconds a port enumeration is reused (one OS walk per refresh pass)
+
+# bytes.translate table clearing the MSB of every byte (7-bit data part of the encoding)
+LOW_7_BITS = bytes(b & 0x7F for b in range(256))
+
+# SWAR MSB gather over a 7-byte group read little-endian: masking keeps bit 8j+7 of each
+# byte j, and the multiply moves it to bit 49+j (shifts 42-7j never collide, so no carries).
+# The software equivalent of PEXT without BMI2.
+MSB_MASK = 0x80808080808080
+MSB_GATHER = 0x0002040810204081
+
+
+def pack_media_sync_fields(buf, media_index, position_ms, state):
+    """Write the per-update fields (index, 7-bit position, state) of a 27-byte Media Sync frame"""
+    media_index = max(0, min(127, media_index))
+    position_ms &= 0xFFFFFFFF
+    
+    # 7-bit encode the big-endian uint32: MSBs of the 4 bytes packed in the first byte
+    msb_byte = (((position_ms >> 31) & 0x01) | ((position_ms >> 22) & 0x02) |
+                ((position_ms >> 13) & 0x04) | ((position_ms >> 4) & 0x08))
+    struct.pack_into('>7B', buf, 19,
+                     media_index,
+                     msb_byte,
+                     (position_ms >> 24) & 0x7F,
+                     (position_ms >> 16) & 0x7F,
+                     (position_ms >> 8) & 0x7F,
+                     position_ms & 0x7F,
+                     1 if state == 'playing' else 0)
+
+
 class OutputManager:
+    # SysEx constants (matching Nowde firmware), shared by all instances
+    SYSEX_START = 0xF0
+    SYSEX_END = 0xF7
+    SYSEX_MANUFACTURER_ID = 0x7D
+    
+    # Bridge → Nowde Direct (0x01-0x0F)
+    SYSEX_CMD_QUERY_CONFIG = 0x01
+    SYSEX_CMD_PUSH_FULL_CONFIG = 0x02
+    SYSEX_CMD_QUERY_RUNNING_STATE = 0x03
+    SYSEX_CMD_ENTER_BOOTLOADER = 0x04  # Deprecated
+    SYSEX_CMD_OTA_BEGIN = 0x05
+    SYSEX_CMD_OTA_DATA = 0x06
+    SYSEX_CMD_OTA_END = 0x07
+    
+    # Bridge → Receivers via Sender (0x10-0x1F)
+    SYSEX_CMD_MEDIA_SYNC = 0x10
+    SYSEX_CMD_CHANGE_RECEIVER_LAYER = 0x11
+    
+    # Nowde → Bridge Responses (0x20-0x3F)
+    SYSEX_CMD_CONFIG_STATE = 0x20
+    SYSEX_CMD_RUNNING_STATE = 0x21
+    SYSEX_CMD_ERROR_REPORT = 0x30
+    
+    # Command-only messages (F0 7D CMD F7) never change
+    MSG_QUERY_CONFIG = bytes((SYSEX_START, SYSEX_MANUFACTURER_ID, SYSEX_CMD_QUERY_CONFIG, SYSEX_END))
+    MSG_QUERY_RUNNING_STATE = bytes((SYSEX_START, SYSEX_MANUFACTURER_ID, SYSEX_CMD_QUERY_RUNNING_STATE, SYSEX_END))
+    MSG_ENTER_BOOTLOADER = bytes((SYSEX_START, SYSEX_MANUFACTURER_ID, SYSEX_CMD_ENTER_BOOTLOADER, SYSEX_END))
+    MSG_OTA_END = bytes((SYSEX_START, SYSEX_MANUFACTURER_ID, SYSEX_CMD_OTA_END, SYSEX_END))
+    
     def __init__(self):
         self.midi_out = rtmidi.MidiOut()
         self.current_port = None
-        
-        # SysEx constants (matching Nowde firmware)
-        self.SYSEX_START = 0xF0
-        self.SYSEX_END = 0xF7
-        self.SYSEX_MANUFACTURER_ID = 0x7D
-        
-        # Bridge → Nowde Direct (0x01-0x0F)
-        self.SYSEX_CMD_QUERY_CONFIG = 0x01
-        self.SYSEX_CMD_PUSH_FULL_CONFIG = 0x02
-        self.SYSEX_CMD_QUERY_RUNNING_STATE = 0x03
-        self.SYSEX_CMD_ENTER_BOOTLOADER = 0x04  # Deprecated
-        self.SYSEX_CMD_OTA_BEGIN = 0x05
-        self.SYSEX_CMD_OTA_DATA = 0x06
-        self.SYSEX_CMD_OTA_END = 0x07
-        
-        # Bridge → Receivers via Sender (0x10-0x1F)
-        self.SYSEX_CMD_MEDIA_SYNC = 0x10
-        self.SYSEX_CMD_CHANGE_RECEIVER_LAYER = 0x11
-        
-        # Nowde → Bridge Responses (0x20-0x3F)
-        self.SYSEX_CMD_CONFIG_STATE = 0x20
-        self.SYSEX_CMD_RUNNING_STATE = 0x21
-        self.SYSEX_CMD_ERROR_REPORT = 0x30
+        self.ports_cache = None  # (monotonic time, get_ports() result) of the last enumeration
+        
+        # Command -> log formatter used by format_sysex_message
+        self.sysex_formatters = {
+            self.SYSEX_CMD_QUERY_CONFIG: self._format_query_config,
+            self.SYSEX_CMD_PUSH_FULL_CONFIG: self._format_push_full_config,
+            self.SYSEX_CMD_QUERY_RUNNING_STATE: self._format_query_running_state,
+            self.SYSEX_CMD_CHANGE_RECEIVER_LAYER: self._format_change_receiver_layer,
+            self.SYSEX_CMD_MEDIA_SYNC: self._format_media_sync,
+        }
+        
+        # Log text of the command-only messages, formatted once
+        self.msg_log_text = {message: self.format_sysex_message(message)
+                             for message in (self.MSG_QUERY_CONFIG, self.MSG_QUERY_RUNNING_STATE,
+                                             self.MSG_ENTER_BOOTLOADER)}
     
     def encode_7bit(self, data_bytes):
         """Encode bytes to 7-bit MIDI-safe format.
         Every 7 bytes becomes 8 bytes (MSBs packed in first byte).
         
         Args:
-            data_bytes: List of integers (0-255) to encode
+            data_bytes: Integers (0-255) to encode, as a list, bytes or bytearray
         Returns:
-            List of 7-bit safe bytes (0-127)
+            bytearray of 7-bit safe bytes (0-127)
         """
-        result = []
-        i = 0
-        while i < len(data_bytes):
-            # Pack MSBs of next 7 bytes into first output byte
-            chunk_size = min(7, len(data_bytes) - i)
-            msb_byte = 0
-            for j in range(chunk_size):
-                if data_bytes[i + j] & 0x80:
-                    msb_byte |= (1 << j)
-            result.append(msb_byte)
+        data = bytes(data_bytes)
+        # Clear all MSBs in one C-level pass, then interleave with the MSB bytes per chunk
+        low_bits = data.translate(LOW_7_BITS)
+        from_bytes = int.from_bytes
+        result = bytearray()
+        for i in range(0, len(data), 7):
+            # Pack MSBs of next 7 bytes into first output byte (a short tail reads as zero-padded)
+            group = from_bytes(data[i:i + 7], 'little') & MSB_MASK
+            result.append(((group * MSB_GATHER) >> 49) & 0x7F)
             
-            # Add 7-bit data (clear MSB)
-            for j in range(chunk_size):
-                result.append(data_bytes[i + j] & 0x7F)
-            
-            i += chunk_size
+            # Add 7-bit data (MSB already cleared)
+            result += low_bits[i:i + 7]
         
         return result
-        
-        # Bridge → Nowde Direct (0x01-0x0F)
-        self.SYSEX_CMD_QUERY_CONFIG = 0x01
-        self.SYSEX_CMD_PUSH_FULL_CONFIG = 0x02
-        self.SYSEX_CMD_QUERY_RUNNING_STATE = 0x03
-        
-        # Bridge → Receivers via Sender (0x10-0x1F)
-        self.SYSEX_CMD_MEDIA_SYNC = 0x10
-        self.SYSEX_CMD_CHANGE_RECEIVER_LAYER = 0x11
-        
-        # Nowde → Bridge Responses (0x20-0x3F)
-        self.SYSEX_CMD_CONFIG_STATE = 0x20
-        self.SYSEX_CMD_RUNNING_STATE = 0x21
-        self.SYSEX_CMD_ERROR_REPORT = 0x30
 
     def get_ports(self):
-        """Get list of available MIDI output ports"""
+        """Get list of available MIDI output ports (reused for PORTS_CACHE_TTL)"""
+        cache = self.ports_cache
+        if cache is not None and time.monotonic() - cache[0] < PORTS_CACHE_TTL:
+            return cache[1]
         try:
             ports = self.midi_out.get_ports()
             if not ports:
-                return ["No MIDI ports available"]
+                ports = ["No MIDI ports available"]
+            self.ports_cache = (time.monotonic(), ports)
             return ports
         except Exception as e:
             # Port list changed during enumeration (device unplugged)
+            self.ports_cache = None
             print(f"Warning: Error enumerating MIDI output ports: {e}")
             return []
 
-    def open_port(self, port_name):
-        """Open a MIDI output port by name"""
-        ports = self.midi_out.get_ports()
-        if port_name in ports:
+    def open_port(self, port_name, port_index=None):
+        """Open a MIDI output port by name
+        port_index: its index in a get_ports() list the caller just fetched (skips a re-enumeration)
+        """
+        if port_index is None:
+            ports = self.get_ports()
+            if port_name not in ports:
+                return False
             port_index = ports.index(port_name)
-            self.midi_out.open_port(port_index)
-            self.current_port = port_name
-            print(f"Opened MIDI port: {port_name}")
-            return True
-        return False
+        self.midi_out.open_port(port_index)
+        self.current_port = port_name
+        print(f"Opened MIDI port: {port_name}")
+        return True
 
     def close_port(self):
         """Close the currently open MIDI port"""
@@ -116,6 +160,11 @@ class OutputManager:
             self.midi_out.close_port()
             self.current_port = None
             print("Closed MIDI port")
+        self.invalidate_ports_cache()
+    
+    def invalidate_ports_cache(self):
+        """Make the next get_ports() enumerate again (port change, hotplug event)"""
+        self.ports_cache = None
     
     def send_query_config(self):
         """Send QUERY_CONFIG to request current config and activate sender mode"""
@@ -123,11 +172,10 @@ class OutputManager:
             return False
         
         # F0 7D 01 F7
-        message = [self.SYSEX_START, self.SYSEX_MANUFACTURER_ID, 
-                   self.SYSEX_CMD_QUERY_CONFIG, self.SYSEX_END]
+        message = self.MSG_QUERY_CONFIG
         self.midi_out.send_message(message)
         print("Sent QUERY_CONFIG SysEx")
-        return (True, self.format_sysex_message(message))
+        return (True, self.msg_log_text[message])
     
     def send_push_full_config(self, rf_sim_enabled, rf_sim_max_delay_ms):
         """Send PUSH_FULL_CONFIG to apply configuration to sender
@@ -145,8 +193,8 @@ class OutputManager:
         delay_hi = (rf_sim_max_delay_ms >> 7) & 0x7F  # Upper 7 bits
         delay_lo = rf_sim_max_delay_ms & 0x7F          # Lower 7 bits
         
-        message = [self.SYSEX_START, self.SYSEX_MANUFACTURER_ID, 
-                   self.SYSEX_CMD_PUSH_FULL_CONFIG, enabled_byte, delay_hi, delay_lo, self.SYSEX_END]
+        message = bytes((self.SYSEX_START, self.SYSEX_MANUFACTURER_ID,
+                         self.SYSEX_CMD_PUSH_FULL_CONFIG, enabled_byte, delay_hi, delay_lo, self.SYSEX_END))
         self.midi_out.send_message(message)
         print(f"Sent PUSH_FULL_CONFIG: RF Sim={'ON' if rf_sim_enabled else 'OFF'}, MaxDelay={rf_sim_max_delay_ms}ms")
         return (True, self.format_sysex_message(message))
@@ -157,11 +205,10 @@ class OutputManager:
             return False
         
         # F0 7D 03 F7
-        message = [self.SYSEX_START, self.SYSEX_MANUFACTURER_ID, 
-                   self.SYSEX_CMD_QUERY_RUNNING_STATE, self.SYSEX_END]
+        message = self.MSG_QUERY_RUNNING_STATE
         self.midi_out.send_message(message)
         # print("Sent QUERY_RUNNING_STATE SysEx")
-        return (True, self.format_sysex_message(message))
+        return (True, self.msg_log_text[message])
     
     def send_enter_bootloader(self):
         """Send ENTER_BOOTLOADER command to trigger firmware update mode (DEPRECATED - use OTA)"""
@@ -169,11 +216,10 @@ class OutputManager:
             return False, "No MIDI port open"
         
         # F0 7D 04 F7
-        message = [self.SYSEX_START, self.SYSEX_MANUFACTURER_ID, 
-                   self.SYSEX_CMD_ENTER_BOOTLOADER, self.SYSEX_END]
+        message = self.MSG_ENTER_BOOTLOADER
         self.midi_out.send_message(message)
         print("Sent ENTER_BOOTLOADER SysEx")
-        return (True, self.format_sysex_message(message))
+        return (True, self.msg_log_text[message])
     
     def send_ota_begin(self, firmware_size):
         """Send OTA_BEGIN to start firmware update
@@ -184,18 +230,13 @@ class OutputManager:
         if not self.current_port:
             return False, "No MIDI port open"
         
-        # Convert size to 4 bytes and 7-bit encode
-        size_bytes = [
-            (firmware_size >> 24) & 0xFF,
-            (firmware_size >> 16) & 0xFF,
-            (firmware_size >> 8) & 0xFF,
-            firmware_size & 0xFF
-        ]
-        size_encoded = self.encode_7bit(size_bytes)
+        # Convert size to 4 bytes (big-endian uint32) and 7-bit encode
+        size_encoded = self.encode_7bit((firmware_size & 0xFFFFFFFF).to_bytes(4, 'big'))
         
         # F0 7D 05 [size_encoded(5 bytes)] F7
-        message = [self.SYSEX_START, self.SYSEX_MANUFACTURER_ID, 
-                   self.SYSEX_CMD_OTA_BEGIN] + size_encoded + [self.SYSEX_END]
+        message = bytearray((self.SYSEX_START, self.SYSEX_MANUFACTURER_ID, self.SYSEX_CMD_OTA_BEGIN))
+        message += size_encoded
+        message.append(self.SYSEX_END)
         self.midi_out.send_message(message)
         print(f"Sent OTA_BEGIN: {firmware_size} bytes")
         return (True, f"OTA BEGIN: {firmware_size} bytes")
@@ -210,11 +251,12 @@ class OutputManager:
             return False, "No MIDI port open"
         
         # 7-bit encode the data
-        encoded = self.encode_7bit(list(data_chunk))
+        encoded = self.encode_7bit(data_chunk)
         
         # F0 7D 06 [data_encoded] F7
-        message = [self.SYSEX_START, self.SYSEX_MANUFACTURER_ID, 
-                   self.SYSEX_CMD_OTA_DATA] + encoded + [self.SYSEX_END]
+        message = bytearray((self.SYSEX_START, self.SYSEX_MANUFACTURER_ID, self.SYSEX_CMD_OTA_DATA))
+        message += encoded
+        message.append(self.SYSEX_END)
         
         self.midi_out.send_message(message)
         return (True, f"OTA DATA: {len(data_chunk)} bytes")
@@ -225,9 +267,7 @@ class OutputManager:
             return False, "No MIDI port open"
         
         # F0 7D 07 F7
-        message = [self.SYSEX_START, self.SYSEX_MANUFACTURER_ID, 
-                   self.SYSEX_CMD_OTA_END, self.SYSEX_END]
-        self.midi_out.send_message(message)
+        self.midi_out.send_message(self.MSG_OTA_END)
         print("Sent OTA_END")
         return (True, "OTA END")
     
@@ -243,19 +283,17 @@ class OutputManager:
             return False
         
         # Convert MAC string (e.g., "AA:BB:CC:DD:EE:FF") to 6 bytes
-        mac_parts = mac_address.split(':')
-        if len(mac_parts) != 6:
-            print(f"Error: Invalid MAC address format: {mac_address}")
-            return False
-        
         try:
-            mac_bytes = [int(part, 16) for part in mac_parts]
+            mac_bytes = bytes.fromhex(mac_address.replace(':', ''))
         except ValueError:
             print(f"Error: Invalid MAC address hex values: {mac_address}")
             return False
+        if len(mac_bytes) != 6 or mac_address.count(':') != 5:
+            print(f"Error: Invalid MAC address format: {mac_address}")
+            return False
         
-        # Pad or truncate layer name to exactly 16 bytes
-        layer_bytes = list((layer_name[:16] + '\x00' * 16)[:16].encode('ascii'))
+        # Truncate or NUL-pad layer name to exactly 16 bytes (non-ASCII characters become '?')
+        layer_bytes = layer_name.encode('ascii', 'replace')[:16].ljust(16, b'\x00')
         
         # 7-bit encode MAC (6 bytes -> 7 bytes encoded)
         mac_encoded = self.encode_7bit(mac_bytes)
@@ -263,9 +301,10 @@ class OutputManager:
         # 7-bit encode layer name (16 bytes -> 19 bytes encoded)
         layer_encoded = self.encode_7bit(layer_bytes)
         
-        message = ([self.SYSEX_START, self.SYSEX_MANUFACTURER_ID, 
-                   self.SYSEX_CMD_CHANGE_RECEIVER_LAYER] + 
-                   mac_encoded + layer_encoded + [self.SYSEX_END])
+        message = bytearray((self.SYSEX_START, self.SYSEX_MANUFACTURER_ID, self.SYSEX_CMD_CHANGE_RECEIVER_LAYER))
+        message += mac_encoded
+        message += layer_encoded
+        message.append(self.SYSEX_END)
         
         self.midi_out.send_message(message)
         print(f"Sent Change Receiver Layer SysEx: MAC={mac_address}, Layer={layer_name}")
@@ -282,39 +321,73 @@ class OutputManager:
             media_index: Media index 0-127 (0=stop, 1-127=media number)
             position_ms: Position in milliseconds (uint32, 4 bytes raw -> 5 bytes encoded)
             state: 0=stopped, 1=playing
+        
+        One-off sends only: the sync loops reuse per-layer frames through
+        send_media_sync_into() / send_media_sync_batch(), which skip the log text.
         """
-        if not self.current_port:
+        # One 27-byte frame filled in place, as on the hot path
+        message = self.new_media_sync_buffer(layer_name)
+        if not self.send_media_sync_into(message, media_index, position_ms, state):
             return False
+        # Don't print every sync message to avoid spam
+        return (True, self.format_sysex_message(message))
+    
+    def new_media_sync_buffer(self, layer_name):
+        """Allocate a reusable 'Media Sync' SysEx frame for one layer
         
-        # Pad or truncate layer name to exactly 16 bytes
-        layer_bytes = (layer_name[:16] + '\x00' * 16)[:16].encode('ascii')
+        Header, layer name and SysEx end byte are written once here;
+        send_media_sync_into() only fills the per-update fields in place.
         
-        # Clamp media index to valid range
-        media_index = max(0, min(127, media_index))
+        Args:
+            layer_name: Layer name (max 16 chars, padded with NUL bytes, non-ASCII as '?')
+        Returns:
+            bytearray of 27 bytes
+        """
+        buf = bytearray(27)
+        struct.pack_into('>3B16s', buf, 0, self.SYSEX_START, self.SYSEX_MANUFACTURER_ID,
+                         self.SYSEX_CMD_MEDIA_SYNC, layer_name.encode('ascii', 'replace')[:16])
+        buf[26] = self.SYSEX_END
+        return buf
+    
+    def send_media_sync_into(self, buf, media_index, position_ms, state):
+        """Send 'Media Sync' SysEx using a frame from new_media_sync_buffer()
         
-        # Convert state to byte (0=stopped, 1=playing)
-        state_byte = 1 if state == 'playing' else 0
+        Same wire format as send_media_sync(), but the frame is updated in place
+        and no log string is built (hot path).
         
-        # Convert position_ms to 4 bytes (big-endian uint32) and 7-bit encode
-        position_bytes_raw = [
-            (position_ms >> 24) & 0xFF,
-            (position_ms >> 16) & 0xFF,
-            (position_ms >> 8) & 0xFF,
-            position_ms & 0xFF
-        ]
-        position_bytes_encoded = self.encode_7bit(position_bytes_raw)
+        Args:
+            buf: Frame returned by new_media_sync_buffer()
+            media_index: Media index 0-127 (0=stop, 1-127=media number)
+            position_ms: Position in milliseconds (uint32)
+            state: 'playing' or 'stopped'
+        """
+        if not self.current_port:
+            return False
         
-        message = ([self.SYSEX_START, self.SYSEX_MANUFACTURER_ID, 
-                   self.SYSEX_CMD_MEDIA_SYNC] + 
-                   list(layer_bytes) + 
-                   [media_index] + 
-                   position_bytes_encoded + 
-                   [state_byte] + 
-                   [self.SYSEX_END])
+        pack_media_sync_fields(buf, media_index, position_ms, state)
+        self.midi_out.send_message(bytes(buf))
+        return True
+    
+    def send_media_sync_batch(self, frames):
+        """Send several 'Media Sync' frames back to back (e.g. one simulation clock tick)
         
-        self.midi_out.send_message(message)
-        # Don't print every sync message to avoid spam
-        return (True, self.format_sysex_message(message))
+        Args:
+            frames: Iterable of (buf, media_index, position_ms, state), buf from new_media_sync_buffer()
+        Returns:
+            Number of frames sent (0 when no port is open)
+        """
+        if not self.current_port:
+            return 0
+        
+        # Bound once for the whole batch
+        send_message = self.midi_out.send_message
+        pack = pack_media_sync_fields
+        sent = 0
+        for buf, media_index, position_ms, state in frames:
+            pack(buf, media_index, position_ms, state)
+            send_message(bytes(buf))
+            sent += 1
+        return sent
     
     def format_sysex_message(self, message):
         """Format SysEx message for human-readable logging"""
@@ -323,64 +396,61 @@ class OutputManager:
         
         # Check if it's our manufacturer ID
         if len(message) < 3 or message[1] != self.SYSEX_MANUFACTURER_ID:
-            return f"SysEx (Unknown): {' '.join(f'{b:02X}' for b in message)}"
+            return f"SysEx (Unknown): {bytes(message).hex(' ').upper()}"
         
         cmd = message[2]
+        formatter = self.sysex_formatters.get(cmd)
+        if formatter:
+            return formatter(message)
         
-        if cmd == self.SYSEX_CMD_QUERY_CONFIG:
-            return "SysEx: QUERY_CONFIG (F0 7D 01 F7)"
-        
-        elif cmd == self.SYSEX_CMD_PUSH_FULL_CONFIG:
-            if len(message) >= 7:
-                rf_sim = "ON" if message[3] != 0 else "OFF"
-                max_delay = (message[4] << 8) | message[5]
-                return f"SysEx: PUSH_FULL_CONFIG RF={rf_sim}, MaxDelay={max_delay}ms"
-            else:
-                hex_str = ' '.join(f'{b:02X}' for b in message)
-                return f"SysEx: PUSH_FULL_CONFIG (malformed) ({hex_str})"
-        
-        elif cmd == self.SYSEX_CMD_QUERY_RUNNING_STATE:
-            return "SysEx: QUERY_RUNNING_STATE (F0 7D 03 F7)"
-        
-        elif cmd == self.SYSEX_CMD_CHANGE_RECEIVER_LAYER:
-            # Extract MAC and layer name
-            # Format: F0 7D 04 [MAC(6)] [Layer(16)] F7
-            if len(message) >= 26:  # F0 7D 04 + 6 MAC + 16 Layer + F7
-                mac_bytes = message[3:9]
-                mac_str = ':'.join(f'{b:02X}' for b in mac_bytes)
-                layer_bytes = message[9:-1]
-                layer_name = bytes(layer_bytes).decode('ascii', errors='ignore').rstrip('\x00')
-                hex_str = ' '.join(f'{b:02X}' for b in message)
-                return f"SysEx: Change Receiver Layer MAC={mac_str}, Layer='{layer_name}' ({hex_str})"
-            else:
-                hex_str = ' '.join(f'{b:02X}' for b in message)
-                return f"SysEx: Change Receiver Layer (malformed) ({hex_str})"
-        
-        elif cmd == self.SYSEX_CMD_MEDIA_SYNC:
-            # Extract layer, index, position, state
-            # Format: F0 7D 10 [Layer(16)] [Index(1)] [Position_encoded(5)] [State(1)] F7
-            if len(message) >= 27:  # F0 7D 10 + 16 Layer + 1 Index + 5 Position_encoded + 1 State + F7
-                layer_bytes = message[3:19]
-                layer_name = bytes(layer_bytes).decode('ascii', errors='ignore').rstrip('\x00')
-                media_index = message[19]
-                # Decode 7-bit encoded position (5 bytes -> 4 bytes)
-                position_encoded = message[20:25]
-                msb_byte = position_encoded[0]
-                position_bytes = []
-                for i in range(4):
-                    byte_val = position_encoded[i + 1]
-                    if msb_byte & (1 << i):
-                        byte_val |= 0x80
-                    position_bytes.append(byte_val)
-                position_ms = (position_bytes[0] << 24) | (position_bytes[1] << 16) | (position_bytes[2] << 8) | position_bytes[3]
-                state_byte = message[25]
-                state_str = "playing" if state_byte == 1 else "stopped"
-                position_s = position_ms / 1000.0
-                return f"SysEx: Media Sync Layer='{layer_name}', Index={media_index}, Pos={position_s:.2f}s, State={state_str}"
-            else:
-                hex_str = ' '.join(f'{b:02X}' for b in message)
-                return f"SysEx: Media Sync (malformed) ({hex_str})"
-        
-        else:
-            hex_str = ' '.join(f'{b:02X}' for b in message)
-            return f"SysEx (CMD 0x{cmd:02X}): {hex_str}"
+        hex_str = bytes(message).hex(' ').upper()
+        return f"SysEx (CMD 0x{cmd:02X}): {hex_str}"
+    
+    def _format_query_config(self, message):
+        """Log text for QUERY_CONFIG (F0 7D 01 F7)"""
+        return "SysEx: QUERY_CONFIG (F0 7D 01 F7)"
+    
+    def _format_push_full_config(self, message):
+        """Log text for PUSH_FULL_CONFIG (F0 7D 02 [rfSimEnabled] [delayHi] [delayLo] F7)"""
+        if len(message) >= 7:
+            rf_sim = "ON" if message[3] != 0 else "OFF"
+            max_delay = (message[4] << 8) | message[5]
+            return f"SysEx: PUSH_FULL_CONFIG RF={rf_sim}, MaxDelay={max_delay}ms"
+        hex_str = bytes(message).hex(' ').upper()
+        return f"SysEx: PUSH_FULL_CONFIG (malformed) ({hex_str})"
+    
+    def _format_query_running_state(self, message):
+        """Log text for QUERY_RUNNING_STATE (F0 7D 03 F7)"""
+        return "SysEx: QUERY_RUNNING_STATE (F0 7D 03 F7)"
+    
+    def _format_change_receiver_layer(self, message):
+        """Log text for Change Receiver Layer"""
+        # Extract MAC and layer name
+        # Format: F0 7D 04 [MAC(6)] [Layer(16)] F7
+        if len(message) >= 26:  # F0 7D 04 + 6 MAC + 16 Layer + F7
+            mac_bytes = message[3:9]
+            mac_str = bytes(mac_bytes).hex(':').upper()
+            layer_name = bytes(message[9:-1]).rstrip(b'\x00').decode('ascii', errors='ignore')
+            hex_str = bytes(message).hex(' ').upper()
+            return f"SysEx: Change Receiver Layer MAC={mac_str}, Layer='{layer_name}' ({hex_str})"
+        hex_str = bytes(message).hex(' ').upper()
+        return f"SysEx: Change Receiver Layer (malformed) ({hex_str})"
+    
+    def _format_media_sync(self, message):
+        """Log text for Media Sync"""
+        # Extract layer, index, position, state
+        # Format: F0 7D 10 [Layer(16)] [Index(1)] [Position_encoded(5)] [State(1)] F7
+        if len(message) >= 27:  # F0 7D 10 + 16 Layer + 1 Index + 5 Position_encoded + 1 State + F7
+            layer_name = bytes(message[3:19]).rstrip(b'\x00').decode('ascii', errors='ignore')
+            media_index = message[19]
+            # Decode 7-bit encoded position (5 bytes -> 4 bytes): MSB i goes back to bit 8*(3-i)+7
+            msb_byte = message[20]
+            position_ms = (int.from_bytes(message[21:25], 'big') |
+                           ((msb_byte & 0x01) << 31) | ((msb_byte & 0x02) << 22) |
+                           ((msb_byte & 0x04) << 13) | ((msb_byte & 0x08) << 4))
+            state_byte = message[25]
+            state_str = "playing" if state_byte == 1 else "stopped"
+            position_s = position_ms / 1000.0
+            return f"SysEx: Media Sync Layer='{layer_name}', Index={media_index}, Pos={position_s:.2f}s, State={state_str}"
+        hex_str = bytes(message).hex(' ').upper()
+        return f"SysEx: Media Sync (malformed) ({hex_str})"
@@ -16,9 +16,13 @@
 
 from pythonosc import dispatcher
 from pythonosc import osc_server
+import socket
 import threading
 
 
+RECV_BUFFER_SIZE = 1 << 20  # bytes; kernel UDP buffer absorbs Millumin bursts while the handler runs
+
+
 class OSCServer:
     def __init__(self, callback, address="127.0.0.1", port=8000):
         self.address = address
@@ -32,14 +36,18 @@ class OSCServer:
         disp.set_default_handler(self.handle_message)
         
         self.server = osc_server.BlockingOSCUDPServer((self.address, self.port), disp)
+        try:
+            self.server.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER_SIZE)
+        except OSError as e:
+            print(f"Warning: Could not set OSC receive buffer size: {e}")
         self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
         self.thread.start()
         print(f"OSC Server started on {self.address}:{self.port}")
 
     def handle_message(self, address, *args):
-        message = f"{address}: {args}"
+        # Hand over the typed arguments; formatting is left to whoever logs them
         if self.callback:
-            self.callback(message)
+            self.callback(address, args)
 
     def stop(self):
         if self.server: